@@ -6,6 +6,8 @@ Detects precise body outline like PNG background removal
 import cv2
 import numpy as np
 import os
+import queue
+import threading
 import mediapipe as mp
 
 class BackgroundEngine:
@@ -13,19 +15,79 @@ class BackgroundEngine:
         """Initialize background replacement with MediaPipe body segmentation"""
         self.current_background = None
         
+        # Background resized to the frame size, rebuilt only when the
+        # source image or the frame size changes
+        self._resized_bg = None
+        self._resized_shape = None
+        
+        # Decoded backgrounds by path, already at frame size
+        self.background_cache = {}
+        
         # Initialize MediaPipe Selfie Segmentation
         self.mp_selfie_segmentation = mp.solutions.selfie_segmentation
         self.selfie_segmentation = self.mp_selfie_segmentation.SelfieSegmentation(
             model_selection=1  # 1 for general model (better for full body)
         )
+        self.segmentation_size = (256, 144)  # (width, height) - the landscape model input, 16:9 like the frame
+        
+        # Segment every Nth frame and reuse the (smoothed) mask in between
+        self.segment_every = 2
+        self._frame_count = 0
+        self._last_mask = None
+        self._segment_lock = threading.Lock()  # One segmentation at a time
+        
+        # Background segmentation worker - callers hand it frames and pick
+        # up the newest finished mask without waiting
+        self._mask_latest = None
+        self._mask_lock = threading.Lock()
+        self._mask_worker_q = queue.Queue(maxsize=1)
+        self._mask_worker = None
+        
+        # Persistent scratch arrays passed as dst= to OpenCV, see _buf
+        self._buffers = {}
+        
+        # Run the compositing blend through OpenCL (T-API) when available
+        self.use_opencl = cv2.ocl.haveOpenCL()
+        if self.use_opencl:
+            cv2.ocl.setUseOpenCL(True)
         
         print("MediaPipe Body Segmentation background engine initialized!")
 
+    def _buf(self, name, shape, dtype=np.uint8):
+        """Get a persistent scratch array, allocated on first use per shape"""
+        key = (name, shape, np.dtype(dtype))
+        buf = self._buffers.get(key)
+        if buf is None:
+            buf = np.empty(shape, dtype)
+            self._buffers[key] = buf
+        return buf
+
+    def preload_backgrounds(self, background_paths, size=(1280, 720)):
+        """Decode and resize backgrounds up front so selecting one is instant"""
+        for background_path in background_paths:
+            if background_path in self.background_cache or not os.path.exists(background_path):
+                continue
+            
+            image = cv2.imread(background_path)
+            if image is not None:
+                self.background_cache[background_path] = np.ascontiguousarray(
+                    cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+                )
+        
+        print(f"Preloaded {len(self.background_cache)} backgrounds")
+
     def change_background(self, background_path):
         """Change background instantly"""
         try:
-            if os.path.exists(background_path):
+            if background_path in self.background_cache:
+                self.current_background = self.background_cache[background_path]
+                self._resized_bg = None
+                self._resized_shape = None
+                return True
+            elif os.path.exists(background_path):
                 self.current_background = cv2.imread(background_path)
+                self._resized_bg = None
+                self._resized_shape = None
                 print(f"Background loaded: {background_path}")
                 return True
             else:
@@ -35,8 +97,15 @@ class BackgroundEngine:
             print(f"Background load error: {e}")
             return False
 
-    def apply_background(self, frame, background_path=None):
-        """Apply background with precise body segmentation"""
+    def apply_background(self, frame, background_path=None, rgb_frame=None, person_mask=None, dst=None):
+        """Apply background with precise body segmentation
+        
+        person_mask is the body mask for frame (see request_person_mask);
+        without one the segmentation worker's newest mask is used, and the
+        frame is returned unchanged until it has one - this never segments
+        on the caller's thread. rgb_frame is unused and kept for callers;
+        dst receives the result (it may be frame itself) instead of a new array
+        """
         if background_path and background_path != getattr(self, 'last_bg_path', None):
             self.change_background(background_path)
             self.last_bg_path = background_path
@@ -45,18 +114,27 @@ class BackgroundEngine:
             return frame
         
         try:
-            # Use MediaPipe for precise body segmentation
-            person_mask = self.get_mediapipe_body_mask(frame)
-            
+            # Never segment here - that would block on the worker's model
+            # run; fall back to the worker's newest mask instead
             if person_mask is None:
-                return frame
+                with self._mask_lock:
+                    person_mask = self._mask_latest
+                if person_mask is None or person_mask.shape != frame.shape[:2]:
+                    return frame
             
-            # Resize background
+            # Resize background once per source image / frame size
             h, w = frame.shape[:2]
-            background = cv2.resize(self.current_background, (w, h))
+            if self._resized_shape != (h, w):
+                if self.current_background.shape[:2] == (h, w):
+                    self._resized_bg = np.ascontiguousarray(self.current_background)
+                else:
+                    self._resized_bg = np.ascontiguousarray(
+                        cv2.resize(self.current_background, (w, h), interpolation=cv2.INTER_AREA)
+                    )
+                self._resized_shape = (h, w)
             
             # Apply precise background replacement
-            result = self.apply_precise_background_replacement(frame, background, person_mask)
+            result = self.apply_precise_background_replacement(frame, self._resized_bg, person_mask, dst)
             
             return result
             
@@ -64,48 +142,206 @@ class BackgroundEngine:
             print(f"Background application error: {e}")
             return frame
 
-    def get_mediapipe_body_mask(self, frame):
-        """Get precise body mask using MediaPipe Selfie Segmentation"""
-        # Convert BGR to RGB for MediaPipe
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    def get_person_mask(self, frame, rgb_frame=None):
+        """Get the body mask, re-segmenting only every Nth frame"""
+        self._frame_count += 1
+        last_mask = self._last_mask
+        
+        if (last_mask is not None and last_mask.shape == frame.shape[:2]
+                and self._frame_count % self.segment_every != 0):
+            return last_mask
+        
+        with self._segment_lock:
+            person_mask = self.get_mediapipe_body_mask(frame, rgb_frame)
+            
+            if person_mask is not None:
+                if last_mask is not None and last_mask.shape == person_mask.shape:
+                    # Blend with the previous mask to avoid flicker
+                    person_mask = cv2.addWeighted(last_mask, 0.5, person_mask, 0.5, 0, dst=last_mask)
+                else:
+                    # Keep our own copy - the scratch buffer is reused next time
+                    person_mask = person_mask.copy()
+        
+        self._last_mask = person_mask
+        return person_mask
+
+    def request_person_mask(self, frame, rgb_frame=None):
+        """Queue frame for background segmentation and return the newest mask
+        
+        Never blocks: the returned mask is usually one frame behind, and is
+        None until the worker has produced a mask of the frame's size
+        """
+        if self._mask_worker is None:
+            self._mask_worker = threading.Thread(target=self._mask_worker_loop, daemon=True)
+            self._mask_worker.start()
+        
+        # The caller keeps drawing on frame, so the worker must not read
+        # its pixels - the RGB copy is left untouched by the UI
+        job = (frame, rgb_frame) if rgb_frame is not None else (frame.copy(), None)
+        try:
+            self._mask_worker_q.put_nowait(job)
+        except queue.Full:
+            pass  # Worker still busy - drop this frame
+        
+        with self._mask_lock:
+            mask = self._mask_latest
+        
+        if mask is None or mask.shape != frame.shape[:2]:
+            return None
+        return mask
+
+    def _mask_worker_loop(self):
+        """Segmentation worker - publishes a new smoothed mask per frame"""
+        while True:
+            job = self._mask_worker_q.get()
+            if job is None:
+                break
+            frame, rgb_frame = job
+            
+            try:
+                with self._segment_lock:
+                    new_mask = self.get_mediapipe_body_mask(frame, rgb_frame)
+                    
+                    with self._mask_lock:
+                        prev_mask = self._mask_latest
+                    
+                    # Published masks are never modified, so always build
+                    # a new array; blend with the previous one to hide jitter
+                    if new_mask is None:
+                        mask = None
+                    elif prev_mask is not None and prev_mask.shape == new_mask.shape:
+                        mask = cv2.addWeighted(prev_mask, 0.5, new_mask, 0.5, 0)
+                    else:
+                        mask = new_mask.copy()
+            except Exception as e:
+                print(f"Segmentation error: {e}")
+                continue
+            
+            with self._mask_lock:
+                self._mask_latest = mask
+
+    def stop_mask_worker(self):
+        """Stop the segmentation worker, letting its current frame finish"""
+        if self._mask_worker is None:
+            return
+        self._mask_worker_q.put(None)
+        self._mask_worker.join(timeout=5.0)
+        self._mask_worker = None
+
+    def get_mediapipe_body_mask(self, frame, rgb_frame=None):
+        """Get precise body mask using MediaPipe Selfie Segmentation
+        
+        The returned mask is a scratch buffer reused by the next call
+        """
+        h, w = frame.shape[:2]
+        
+        # The segmentation model works at 256x144 (landscape), so downscale first
+        # instead of converting and handing over the full-size frame
+        small_shape = (self.segmentation_size[1], self.segmentation_size[0], 3)
+        small_rgb = self._buf('small_rgb', small_shape)
+        if rgb_frame is not None:
+            cv2.resize(rgb_frame, self.segmentation_size, dst=small_rgb, interpolation=cv2.INTER_AREA)
+        else:
+            small_frame = cv2.resize(frame, self.segmentation_size, dst=self._buf('small_bgr', small_shape),
+                                     interpolation=cv2.INTER_AREA)
+            
+            # Convert BGR to RGB for MediaPipe
+            cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB, dst=small_rgb)
         
         # Process frame with MediaPipe
-        results = self.selfie_segmentation.process(rgb_frame)
+        results = self.selfie_segmentation.process(small_rgb)
         
         if results.segmentation_mask is not None:
             # Convert segmentation mask to binary mask
             # MediaPipe gives float values 0-1, convert to 0-255
             segmentation_mask = results.segmentation_mask
             
-            # Convert to binary mask (0 or 255)
-            binary_mask = (segmentation_mask > 0.5).astype(np.uint8) * 255
+            # Go to uint8 straight away so the mask stays 8-bit from here
+            # on, then convert to binary mask (0 or 255) - 127 is the 0.5 cut
+            binary_mask = cv2.convertScaleAbs(segmentation_mask, alpha=255.0,
+                                              dst=self._buf('seg_mask', segmentation_mask.shape))
+            cv2.threshold(binary_mask, 127, 255, cv2.THRESH_BINARY, dst=binary_mask)
             
-            # Apply some smoothing to soften edges
-            binary_mask = cv2.medianBlur(binary_mask, 5)
-            binary_mask = cv2.GaussianBlur(binary_mask, (3, 3), 0)
+            # Scale back up to frame size into the reused mask buffer
+            mask = cv2.resize(binary_mask, (w, h), dst=self._buf('mask', (h, w)),
+                              interpolation=cv2.INTER_LINEAR)
             
-            return binary_mask
+            # Single in-place blur pass to soften edges
+            cv2.GaussianBlur(mask, (5, 5), 0, dst=mask)
+            
+            return mask
         
         return None
 
-    def apply_precise_background_replacement(self, frame, background, person_mask):
-        """Apply precise background replacement using MediaPipe mask"""
-        # Normalize mask to 0-1 range
-        mask_normalized = person_mask.astype(np.float32) / 255.0
+    def apply_precise_background_replacement(self, frame, background, person_mask, dst=None):
+        """Apply precise background replacement using MediaPipe mask
+        
+        The result is written into dst when given (frame itself is allowed)
+        """
+        if self.use_opencl:
+            return self.apply_precise_background_replacement_opencl(frame, background, person_mask, dst)
         
-        # Create 3-channel mask
-        mask_3d = np.stack([mask_normalized] * 3, axis=2)
+        # Outside the person's bounding box the mask is 0, so the result
+        # there is plain background - only blend inside the box
+        x, y, box_w, box_h = cv2.boundingRect(person_mask)
+        if box_w == 0 or box_h == 0:
+            return self._fill_background(background, dst)
+        
+        rows, cols = slice(y, y + box_h), slice(x, x + box_w)
+        mask_3d = self._buf('mask3', frame.shape)[rows, cols]
+        inv_mask_3d = self._buf('inv_mask3', frame.shape)[rows, cols]
+        background_part = self._buf('bg_part', frame.shape)[rows, cols]
+        person_part = self._buf('person_part', frame.shape)[rows, cols]
+        
+        # Keep everything in 8-bit: the mask is used as a 0-255 weight
+        # directly instead of being normalized into a float32 copy.
+        # Intermediates go into buffers kept across frames
+        cv2.merge([person_mask[rows, cols]] * 3, dst=mask_3d)
+        cv2.bitwise_not(mask_3d, dst=inv_mask_3d)
         
         # Apply background replacement with precise body outline
         # Person areas = original frame
         # Background areas = new background
-        person_part = frame.astype(np.float32) * mask_3d
-        background_part = background.astype(np.float32) * (1.0 - mask_3d)
+        cv2.multiply(background[rows, cols], inv_mask_3d, dst=background_part, scale=1.0 / 255)
+        cv2.multiply(frame[rows, cols], mask_3d, dst=person_part, scale=1.0 / 255)
+        
+        # Saturating add keeps the result in uint8 without a clip pass
+        cv2.add(person_part, background_part, dst=person_part)
         
-        result = person_part + background_part
-        result = np.clip(result, 0, 255).astype(np.uint8)
+        # frame is fully read by now, so dst may alias it
+        result = self._fill_background(background, dst)
+        result[rows, cols] = person_part
         
         return result
+    
+    def apply_precise_background_replacement_opencl(self, frame, background, person_mask, dst=None):
+        """Same blend as apply_precise_background_replacement, run on the GPU via cv2.UMat"""
+        x, y, box_w, box_h = cv2.boundingRect(person_mask)
+        if box_w == 0 or box_h == 0:
+            return self._fill_background(background, dst)
+        
+        # Upload only the person's bounding box
+        rows, cols = slice(y, y + box_h), slice(x, x + box_w)
+        mask_3d = cv2.merge([cv2.UMat(person_mask[rows, cols])] * 3)
+        inv_mask_3d = cv2.bitwise_not(mask_3d)
+        
+        background_part = cv2.multiply(cv2.UMat(background[rows, cols]), inv_mask_3d, scale=1.0 / 255)
+        person_part = cv2.multiply(cv2.UMat(frame[rows, cols]), mask_3d, scale=1.0 / 255)
+        
+        # Download once at the end - everything downstream works on NumPy
+        blended = cv2.add(person_part, background_part).get()
+        
+        result = self._fill_background(background, dst)
+        result[rows, cols] = blended
+        
+        return result
+    
+    def _fill_background(self, background, dst=None):
+        """Copy background into dst, or into a new array when dst is None"""
+        if dst is None:
+            return background.copy()
+        np.copyto(dst, background)
+        return dst
 
     def reset_background_learning(self):
         """Reset (not needed for MediaPipe approach)"""
@@ -4,6 +4,7 @@ Camera Handler - OpenCV-only face detection (No MediaPipe dependency)
 
 import cv2
 import numpy as np
+import threading
 import time
 
 class CameraHandler:
@@ -16,6 +17,42 @@ class CameraHandler:
         self.last_face_time = 0
         self.face_coords = None  # Added to store face coordinates
         
+        # Background capture thread keeps only the newest frame
+        self._latest = None
+        self._latest_rgb = None
+        self.rgb_frame = None  # RGB copy of the frame last returned by get_frame
+        self._lock = threading.Lock()
+        self._frame_ready = threading.Event()  # Set while a frame not yet taken by latest() is stored
+        self._waiting = False  # latest() is blocked waiting for a frame
+        self._stop = threading.Event()
+        self._thread = None
+        
+        # Frame enhancement runs on the capture thread; it can be switched
+        # off since MediaPipe normalizes its own input
+        self.enhance_enabled = True
+        self._clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        
+        # Persistent scratch arrays passed as dst= to OpenCV, see _buf
+        self._buffers = {}
+        
+        # Run the enhancement chain through OpenCL (T-API) when available
+        self.use_opencl = cv2.ocl.haveOpenCL()
+        if self.use_opencl:
+            cv2.ocl.setUseOpenCL(True)
+        
+        # Face detection runs on a half-size grayscale frame
+        self.face_detect_scale = 2
+        
+        # Once a face is found, only re-run the cascade every Nth frame;
+        # while still searching, every Mth frame
+        self._face_detect_interval = 6
+        self._face_search_interval = 3
+        self._face_frame_counter = 0
+        
+        # Oval person masks only depend on the frame size
+        self._person_mask_cache = {}
+        self._upper_body_mask_cache = {}
+        
         # Initialize OpenCV face detection (Haar Cascades)
         self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
         self.eye_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_eye.xml')
@@ -39,6 +76,14 @@ class CameraHandler:
             self.cap.set(cv2.CAP_PROP_BRIGHTNESS, 0.6)
             self.cap.set(cv2.CAP_PROP_CONTRAST, 0.6)
             
+            # Keep the driver queue short so frames are never stale
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            
+            # Start continuous capture so get_frame never blocks on the driver
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._reader, daemon=True)
+            self._thread.start()
+            
             print("📹 Camera initialized successfully!")
             return True
             
@@ -46,68 +91,170 @@ class CameraHandler:
             print(f"❌ Camera initialization error: {e}")
             return False
     
-    def get_frame(self):
-        """Get current camera frame"""
-        if self.cap is None or not self.cap.isOpened():
-            return None
+    def _buf(self, name, shape, dtype=np.uint8):
+        """Get a persistent scratch array, allocated on first use per shape"""
+        key = (name, shape, np.dtype(dtype))
+        buf = self._buffers.get(key)
+        if buf is None:
+            buf = np.empty(shape, dtype)
+            self._buffers[key] = buf
+        return buf
+    
+    def _reader(self):
+        """Capture loop - continuously store the newest mirrored frame"""
+        while not self._stop.is_set():
+            # grab() dequeues the frame, retrieve() decodes it. Frames are only
+            # decoded and enhanced while latest() is waiting for one, so none
+            # is processed just to be dropped and the one handed over is
+            # always the newest; the rest are only grabbed to drain the driver
+            ret = self.cap.grab()
+            if ret and not self._waiting:
+                continue
+            if ret:
+                ret, frame = self.cap.retrieve()
+            if not ret:
+                with self._lock:
+                    self._latest = None
+                    self._latest_rgb = None
+                self._stop.set()
+                break
+            
+            if self.use_opencl and self.enhance_enabled:
+                # Whole chain on the GPU - one upload, two downloads
+                frame, rgb_frame = self.prepare_frame_opencl(frame)
+            else:
+                # Flip frame horizontally for mirror effect
+                frame = cv2.flip(frame, 1)
+                
+                # Enhance frame quality here so it overlaps with UI work
+                if self.enhance_enabled:
+                    frame = self.enhance_frame(frame)
+                
+                # One shared RGB conversion for the MediaPipe consumers
+                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            
+            with self._lock:
+                self._latest = frame
+                self._latest_rgb = rgb_frame
+                self._frame_ready.set()
+        
+        # Wake up any caller still waiting for a frame
+        self._frame_ready.set()
+    
+    def latest(self):
+        """Get the freshest captured frame without touching the driver
         
-        ret, frame = self.cap.read()
-        if not ret:
+        Waits for the capture thread to decode the next grabbed frame (at
+        most one camera frame period), so callers run at most at the camera
+        frame rate and never get a stale frame (after a 2 s stall the
+        previous frame is returned again); returns None once the camera has
+        stopped delivering frames
+        """
+        if self.cap is None or not self.cap.isOpened():
             return None
         
-        # Flip frame horizontally for mirror effect
-        frame = cv2.flip(frame, 1)
+        # Ask the capture thread for the next frame and wait for it
+        with self._lock:
+            self._waiting = True
+            # Only a frame decoded from now on counts (the event stays set
+            # once capture has stopped, so callers never block then)
+            if not self._stop.is_set():
+                self._frame_ready.clear()
+        self._frame_ready.wait(timeout=2.0)
         
-        # Enhance frame quality
-        frame = self.enhance_frame(frame)
+        with self._lock:
+            self._waiting = False
+            frame = self._latest
+            self.rgb_frame = self._latest_rgb
         
         return frame
     
+    def get_frame(self):
+        """Get current camera frame"""
+        return self.latest()
+    
     def enhance_frame(self, frame):
-        """Enhance frame quality for better appearance"""
-        # Apply slight gaussian blur for smoothing
-        frame = cv2.GaussianBlur(frame, (3, 3), 0)
+        """Enhance frame quality for better appearance
         
-        # Enhance brightness and contrast
+        Works in place - pass a frame the caller owns
+        """
+        if self.use_opencl:
+            return self.enhance_frame_opencl(frame)
+        
+        # Enhance brightness and contrast (in place - CLAHE below does the
+        # smoothing, so there is no separate blur pass)
         alpha = 1.2  # Contrast control
         beta = 10    # Brightness control
-        frame = cv2.convertScaleAbs(frame, alpha=alpha, beta=beta)
+        frame = cv2.convertScaleAbs(frame, dst=frame, alpha=alpha, beta=beta)
         
-        # Apply color correction for better skin tones
-        lab = cv2.cvtColor(frame, cv2.COLOR_BGR2LAB)
-        l, a, b = cv2.split(lab)
+        # Apply CLAHE to the luma channel for better lighting - YCrCb is
+        # cheaper to convert than LAB and only Y needs to be touched
+        ycrcb = cv2.cvtColor(frame, cv2.COLOR_BGR2YCrCb, dst=self._buf('ycrcb', frame.shape))
         
-        # Apply CLAHE to L channel for better lighting
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        l = clahe.apply(l)
+        y = cv2.extractChannel(ycrcb, 0, dst=self._buf('luma', frame.shape[:2]))
+        y = self._clahe.apply(y, dst=self._buf('luma_eq', frame.shape[:2]))
+        cv2.insertChannel(y, ycrcb, 0)
         
-        # Merge channels and convert back
-        lab = cv2.merge((l, a, b))
-        frame = cv2.cvtColor(lab, cv2.COLOR_LAB2BGR)
+        # Convert back into the (already private) output frame
+        frame = cv2.cvtColor(ycrcb, cv2.COLOR_YCrCb2BGR, dst=frame)
         
         return frame
     
+    def _enhance_umat(self, uframe):
+        """The enhance_frame chain on a cv2.UMat, result left on the GPU"""
+        # Enhance brightness and contrast
+        uframe = cv2.convertScaleAbs(uframe, alpha=1.2, beta=10)
+        
+        # CLAHE on the luma channel
+        y, cr, cb = cv2.split(cv2.cvtColor(uframe, cv2.COLOR_BGR2YCrCb))
+        y = self._clahe.apply(y)
+        return cv2.cvtColor(cv2.merge((y, cr, cb)), cv2.COLOR_YCrCb2BGR)
+    
+    def enhance_frame_opencl(self, frame):
+        """Same enhancement as enhance_frame, run on the GPU via cv2.UMat"""
+        # Download once at the end - everything downstream works on NumPy
+        return self._enhance_umat(cv2.UMat(frame)).get()
+    
+    def prepare_frame_opencl(self, frame):
+        """Mirror, enhance and RGB-convert a captured frame via cv2.UMat
+        
+        Returns (bgr, rgb) NumPy frames, same as the CPU path in _reader
+        """
+        uframe = self._enhance_umat(cv2.flip(cv2.UMat(frame), 1))
+        urgb = cv2.cvtColor(uframe, cv2.COLOR_BGR2RGB)
+        return uframe.get(), urgb.get()
+    
     def detect_face(self, frame):
         """Detect face in frame using OpenCV Haar Cascades"""
         if frame is None:
             return False
         
-        # Convert to grayscale for face detection
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        # Faces move slowly - keep the last result between detections
+        self._face_frame_counter += 1
+        interval = self._face_detect_interval if self.face_detected else self._face_search_interval
+        if self._face_frame_counter % interval != 0:
+            return self.face_detected
         
-        # Detect faces
+        # Downscale, then convert to grayscale for face detection
+        scale = self.face_detect_scale
+        small_h, small_w = frame.shape[0] // scale, frame.shape[1] // scale
+        small = cv2.resize(frame, (small_w, small_h), dst=self._buf('face_small', (small_h, small_w, 3)),
+                           interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=self._buf('face_gray', (small_h, small_w)))
+        
+        # Detect faces - only the biggest one is needed
         faces = self.face_cascade.detectMultiScale(
             gray,
             scaleFactor=1.1,
             minNeighbors=5,
-            minSize=(100, 100),
-            flags=cv2.CASCADE_SCALE_IMAGE
+            minSize=(100 // scale, 100 // scale),
+            flags=cv2.CASCADE_FIND_BIGGEST_OBJECT | cv2.CASCADE_DO_ROUGH_SEARCH
         )
         
         if len(faces) > 0:
-            # Get the largest face
+            # Get the largest face, scaled back to frame coordinates
             largest_face = max(faces, key=lambda x: x[2] * x[3])
-            x, y, w, h = largest_face
+            x, y, w, h = (int(v) * scale for v in largest_face)
             
             # Store face coordinates for drawing
             self.face_coords = (x, y, w, h)
@@ -144,13 +291,20 @@ class CameraHandler:
         return frame
     
     def get_person_mask(self, frame):
-        """Get person segmentation mask (simplified version)"""
+        """Get person segmentation mask (simplified version)
+        
+        The mask is cached per frame size and shared - do not modify it
+        """
         if frame is None:
             return None
         
         # Simple background subtraction approach
         height, width = frame.shape[:2]
         
+        mask = self._person_mask_cache.get((height, width))
+        if mask is not None:
+            return mask
+        
         # Create a simple oval mask for person (center of frame)
         mask = np.zeros((height, width), dtype=np.uint8)
         
@@ -161,26 +315,42 @@ class CameraHandler:
         
         # Apply gaussian blur for soft edges
         mask = cv2.GaussianBlur(mask, (21, 21), 0)
+        mask.flags.writeable = False
         
+        self._person_mask_cache[(height, width)] = mask
         return mask
     
     def get_upper_body_mask(self, frame):
-        """Get upper body region mask for clothing application"""
+        """Get upper body region mask for clothing application
+        
+        The mask is cached per frame size and shared - do not modify it
+        """
         person_mask = self.get_person_mask(frame)
         if person_mask is None:
             return None
         
         # Focus on upper 60% of the person
         h, w = person_mask.shape
+        upper_body_mask = self._upper_body_mask_cache.get((h, w))
+        if upper_body_mask is not None:
+            return upper_body_mask
+        
         upper_body_mask = person_mask.copy()
         
         # Mask out lower 40% of the person
         upper_body_mask[int(h * 0.6):, :] = 0
+        upper_body_mask.flags.writeable = False
         
+        self._upper_body_mask_cache[(h, w)] = upper_body_mask
         return upper_body_mask
     
     def release(self):
         """Release camera resources"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        
         if self.cap:
             self.cap.release()
         print("📹 Camera released successfully!")
\ No newline at end of file
@@ -4,7 +4,6 @@ Simple Gesture Detector - Just works, no fancy stuff
 import cv2
 import numpy as np
 import time
-import math
 import mediapipe as mp
 
 class GestureDetector:
@@ -14,46 +13,64 @@ class GestureDetector:
         self.hands = self.mp_hands.Hands(
             static_image_mode=False,
             max_num_hands=1,
+            model_complexity=0,  # Lite landmark model
             min_detection_confidence=0.7,
-            min_tracking_confidence=0.7
+            min_tracking_confidence=0.5  # Track longer before re-running palm detection
         )
         
+        # Only run the hand model every Nth frame and reuse the last result in between
+        self.process_every = 2
+        self._frame_count = 0
+        self._last_results = None
+        
+        self._index_tip_idx = int(self.mp_hands.HandLandmark.INDEX_FINGER_TIP)
+        
         self.finger_pos = None
         self.calibrated = True  # Always calibrated - no setup needed
         
         # Click detection
-        self.hold_start_time = 0
+        self.hold_start_time = None  # None while no hold is in progress
         self.hold_threshold = 1.5
         self.last_pos = None
         self.stability_radius = 25
+        self._stability_radius_sq = self.stability_radius * self.stability_radius
         
         print("Simple gesture detector ready!")
 
-    def detect_finger_click(self, frame):
-        """Simple finger detection - just works"""
+    def detect_finger_click(self, frame, rgb_frame=None):
+        """Simple finger detection - just works
+        
+        rgb_frame is an optional RGB version of frame; when given, the
+        BGR->RGB conversion is skipped
+        """
         if frame is None:
             return None, False
         
         h, w = frame.shape[:2]
         
-        # Process with MediaPipe
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(rgb_frame)
+        # Process with MediaPipe (skipped frames reuse the last result)
+        self._frame_count += 1
+        if self._last_results is None or self._frame_count % self.process_every == 0:
+            if rgb_frame is None:
+                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            self._last_results = self.hands.process(rgb_frame)
+        results = self._last_results
         
         finger_pos = None
         
         if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                # Get finger tip position
-                index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-                
-                x = int(index_tip.x * w)
-                y = int(index_tip.y * h)
-                
-                # Simple bounds check
-                if 0 <= x < w and 0 <= y < h:
-                    finger_pos = (x, y)
-                break
+            # Only one hand is tracked (max_num_hands=1)
+            hand_landmarks = results.multi_hand_landmarks[0]
+            
+            # Get finger tip position
+            index_tip = hand_landmarks.landmark[self._index_tip_idx]
+            
+            x = int(index_tip.x * w)
+            y = int(index_tip.y * h)
+            
+            # Simple bounds check
+            if 0 <= x < w and 0 <= y < h:
+                finger_pos = (x, y)
         
         if finger_pos:
             self.finger_pos = finger_pos
@@ -66,19 +83,18 @@ class GestureDetector:
 
     def detect_hold_click(self, finger_pos):
         """Simple hold detection"""
-        current_time = time.time()
+        current_time = time.monotonic()
         
         if self.last_pos is None:
             self.last_pos = finger_pos
             self.hold_start_time = current_time
             return False
         
-        distance = math.sqrt(
-            (finger_pos[0] - self.last_pos[0])**2 + 
-            (finger_pos[1] - self.last_pos[1])**2
-        )
+        # Compare squared distances - no sqrt needed
+        dx = finger_pos[0] - self.last_pos[0]
+        dy = finger_pos[1] - self.last_pos[1]
         
-        if distance <= self.stability_radius:
+        if dx * dx + dy * dy <= self._stability_radius_sq:
             hold_duration = current_time - self.hold_start_time
             if hold_duration >= self.hold_threshold:
                 self.hold_start_time = current_time
@@ -90,8 +106,11 @@ class GestureDetector:
             
         return False
 
-    def draw_finger_tracking_info(self, frame):
-        """Simple cursor drawing - ALWAYS ON TOP"""
+    def draw_finger_tracking_info(self, frame, now=None):
+        """Simple cursor drawing - ALWAYS ON TOP
+        
+        now is the current frame time; read once per frame by the caller
+        """
         cv2.putText(frame, "Point finger - Hold 1.5s to click", (10, 30),
                     cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
         
@@ -103,8 +122,8 @@ class GestureDetector:
             cv2.circle(frame, (x, y), 5, (255, 255, 255), -1)
             
             # Hold progress
-            if self.last_pos and self.hold_start_time:
-                current_time = time.time()
+            if self.last_pos is not None and self.hold_start_time is not None:
+                current_time = now if now is not None else time.monotonic()
                 hold_progress = (current_time - self.hold_start_time) / self.hold_threshold
                 hold_progress = min(hold_progress, 1.0)
                 
@@ -122,7 +141,7 @@ class GestureDetector:
 
     def reset_calibration(self):
         self.last_pos = None
-        self.hold_start_time = 0
+        self.hold_start_time = None
 
     def get_gesture_confidence(self):
         return 1.0 if self.finger_pos else 0.0
@@ -5,15 +5,48 @@ AI Professional Makeover - Modern animations with reliable structure
 import cv2
 import numpy as np
 import os
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from enum import IntEnum
 from camera_handler import CameraHandler
 from gesture_detector import GestureDetector
 from popup_manager import PopupManager
 from background_engine import BackgroundEngine
+from pipeline_broker import PipelineBroker
 from clothing_engine import ProfessionalClothingEngine as ClothingEngine
 from ui_components import UIComponents
 
+class Step(IntEnum):
+    """Top-level application steps, in order (values index the handler table)"""
+    WELCOME = 0
+    FACE_DETECTION = 1
+    BACKGROUND_SELECTION = 2
+    CLOTHING_SELECTION = 3
+    COMPLETE = 4
+
+class ClothingStep(IntEnum):
+    """Sub-steps of the clothing selection flow"""
+    INITIAL = 0
+    TSHIRT_SELECTION = 1
+    SHIRT_SELECTION = 2
+    ACCESSORIES_SELECTION = 3
+    BLAZER_SELECTION = 4
+    TIE_SELECTION = 5
+
 class ProfessionalMakeoverApp:
+    __slots__ = (
+        'camera', 'gesture_detector', 'popup_manager', 'bg_engine', 'clothing_engine', 'ui', 'pipeline',
+        'current_step', 'face_detected_time', 'welcome_start_time',
+        'selected_background', 'selected_clothing_type', 'selected_clothing_item',
+        'clothing_step', 'selected_clothing_category', 'selected_accessories',
+        'rgb_frame', 'person_mask', 'backgrounds',
+        '_overlay_cache', '_overlay_step', '_last_state_key', '_last_frame', '_last_compose_t',
+        '_ui_layer_key', '_ui_layer', '_save_queue', '_writer', '_handlers', '_clothing_handlers',
+        'display_queue', 'key_queue', 'stop_event',
+    )
+    
     def __init__(self):
         print("🚀 Initializing AI Professional Makeover...")
         
@@ -24,13 +57,51 @@ class ProfessionalMakeoverApp:
             self.bg_engine = BackgroundEngine()
             self.clothing_engine = ClothingEngine()
             self.ui = UIComponents()
+            self.pipeline = PipelineBroker(self.gesture_detector, self.bg_engine)
             
             # Application state
-            self.current_step = "welcome"
+            self.current_step = Step.WELCOME
             self.face_detected_time = 0
+            self.welcome_start_time = None
             self.selected_background = None
             self.selected_clothing_type = None
             self.selected_clothing_item = None
+            self.clothing_step = ClothingStep.INITIAL
+            self.selected_clothing_category = None
+            self.selected_accessories = {}
+            self.rgb_frame = None  # RGB version of the current frame for MediaPipe
+            self.person_mask = None  # Body mask for the current frame
+            self._overlay_cache = {}  # Pre-composed popup layers for the current step
+            self._overlay_step = None
+            self._last_state_key = None  # Inputs behind the last composed frame
+            self._last_frame = None
+            self._last_compose_t = 0
+            self._ui_layer_key = None  # Cached static UI overlay, see draw_static_ui
+            self._ui_layer = None
+            
+            # Screenshots are encoded and written off the processing thread
+            self._save_queue = queue.Queue(maxsize=8)
+            self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+            self._writer.start()
+            
+            # Step handlers indexed by Step, all called as handler(frame, finger_pos, is_clicking, now)
+            self._handlers = (
+                self.handle_welcome_screen_modern,
+                self.handle_face_detection_modern,
+                self.handle_background_selection_modern,
+                self.handle_clothing_selection_modern,
+                self.handle_complete_screen_modern,
+            )
+            
+            # Clothing sub-step handlers indexed by ClothingStep
+            self._clothing_handlers = (
+                self._cloth_initial,
+                self._cloth_tshirt,
+                self._cloth_shirt,
+                self._cloth_accessories,
+                self._cloth_blazer,
+                self._cloth_tie,
+            )
             
             # Load assets
             self.load_assets()
@@ -65,15 +136,32 @@ class ProfessionalMakeoverApp:
         # Create placeholder assets if they don't exist
         self.create_placeholder_assets()
         
+        # Decode every background once, at the processing resolution
+        self.bg_engine.preload_backgrounds(self.backgrounds, (1280, 720))
+        
+        # Popup thumbnails decode in the background meanwhile
+        self.popup_manager.prefetch_thumbnails(self.backgrounds)
+        
         print(f"📁 Loaded {len(self.backgrounds)} background images")
     
     def create_placeholder_assets(self):
         """Create placeholder backgrounds for testing"""
-        for i, bg_path in enumerate(self.backgrounds):
-            if not os.path.exists(bg_path):
-                # Create gradient backgrounds as placeholders
-                img = self.ui.create_gradient_background(640, 480, i)
-                cv2.imwrite(bg_path, img)
+        # One directory listing instead of a stat per background
+        with os.scandir("assets/backgrounds") as entries:
+            existing = {e.name for e in entries if e.is_file()}
+        missing = [(i, bg_path) for i, bg_path in enumerate(self.backgrounds)
+                   if os.path.basename(bg_path) not in existing]
+        
+        # cv2.imwrite releases the GIL, so the JPEG encodes run in parallel
+        with ThreadPoolExecutor(max_workers=4) as ex:
+            list(ex.map(self._ensure_bg, missing))
+    
+    def _ensure_bg(self, indexed_path):
+        """Write a gradient placeholder for one missing background"""
+        i, bg_path = indexed_path
+        # Create gradient backgrounds as placeholders
+        img = self.ui.create_gradient_background(640, 480, i)
+        cv2.imwrite(bg_path, img)
     
     def run(self):
         """Main application loop with modern animations"""
@@ -82,74 +170,179 @@ class ProfessionalMakeoverApp:
         # Create fullscreen window
         cv2.namedWindow('AI Professional Makeover', cv2.WINDOW_NORMAL)
         cv2.setWindowProperty('AI Professional Makeover', cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_FULLSCREEN)
+        fullscreen = True
         
-        while True:
+        # Pipeline: capture thread -> processing worker -> display (here).
+        # imshow/pollKey must stay on the main thread
+        self.stop_event = threading.Event()
+        self.display_queue = queue.Queue(maxsize=2)
+        self.key_queue = queue.Queue()
+        
+        worker = threading.Thread(target=self.process_loop, daemon=True)
+        worker.start()
+        
+        # Bind loop invariants to locals once
+        stop_event = self.stop_event
+        get_display_frame = self.display_queue.get
+        imshow = cv2.imshow
+        monotonic = time.monotonic
+        frame_interval = 1 / 60  # Display pacing
+        
+        # Non-blocking key polling (OpenCV 4.5+), waitKey(1) on older builds
+        pollKey = getattr(cv2, 'pollKey', None) or (lambda: cv2.waitKey(1))
+        
+        while not stop_event.is_set():
             try:
-                # Get camera frame
-                frame = self.camera.get_frame()
-                if frame is None:
-                    print("❌ Error: Could not read from camera")
-                    break
-                
-                # Resize frame for consistent processing
-                frame = cv2.resize(frame, (1280, 720))
-                
-                # Get finger position FIRST (before any drawing)
-                finger_pos, is_clicking = self.gesture_detector.detect_finger_click(frame)
-                
-                # Process current step with modern animations
-                if self.current_step == "welcome":
-                    frame = self.handle_welcome_screen_modern(frame)
-                elif self.current_step == "face_detection":
-                    frame = self.handle_face_detection_modern(frame)
-                elif self.current_step == "background_selection":
-                    frame = self.handle_background_selection_modern(frame, finger_pos, is_clicking)
-                elif self.current_step == "clothing_selection":
-                    frame = self.handle_clothing_selection_modern(frame, finger_pos, is_clicking)
-                elif self.current_step == "complete":
-                    frame = self.handle_complete_screen_modern(frame, finger_pos, is_clicking)
-                
-                # Draw modern finger cursor LAST (always on top)
-                if finger_pos and self.gesture_detector.calibrated:
-                    frame = self.ui.draw_finger_cursor(frame, finger_pos)
+                loop_start = monotonic()
                 
-                # Display frame
-                cv2.imshow('AI Professional Makeover', frame)
+                # Display the newest processed frame, if one is ready
+                try:
+                    frame = get_display_frame(timeout=0.01)
+                    imshow('AI Professional Makeover', frame)
+                except queue.Empty:
+                    pass
                 
                 # Handle key presses
-                key = cv2.waitKey(1) & 0xFF
+                key = pollKey() & 0xFF
                 if key == ord('q') or key == 27:  # Q or ESC to quit
                     break
-                elif key == ord('s'):  # S to start from welcome
-                    self.current_step = "welcome"
-                elif key == ord('r'):  # R to restart
-                    self.restart_application()
-                elif key == ord('f'):  # F to toggle fullscreen
+                elif key == ord('s') or key == ord('r'):  # S / R are state changes for the worker
+                    self.key_queue.put(key)
+                elif key == ord('f') and fullscreen:  # F to leave fullscreen
                     cv2.setWindowProperty('AI Professional Makeover', cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_NORMAL)
+                    fullscreen = False
+                
+                # Don't spin faster than the display rate
+                time.sleep(max(0, frame_interval - (monotonic() - loop_start)))
                 
             except Exception as e:
                 print(f"❌ Main loop error: {e}")
                 break
         
+        # Stop the worker before releasing what it uses
+        self.stop_event.set()
+        worker.join(timeout=2.0)
+        
         # Cleanup
         self.cleanup()
     
-    def handle_welcome_screen_modern(self, frame):
+    def process_loop(self):
+        """Worker thread - gesture detection and step handlers for each frame"""
+        # Bind loop invariants to locals once
+        stop_event = self.stop_event
+        get_latest = self.camera.latest
+        process = self.pipeline.process
+        draw_cursor = self.ui.draw_finger_cursor
+        put_display_frame = self.display_queue.put
+        resize = cv2.resize
+        
+        handlers = self._handlers
+        
+        # Frames are composed in a ring of preallocated buffers - enough that
+        # none is reused while queued, on screen or kept as the last frame
+        work_bufs = [np.empty((720, 1280, 3), dtype=np.uint8)
+                     for _ in range(self.display_queue.maxsize + 3)]
+        work_idx = 0
+        
+        # Camera frames of another size are scaled here before processing
+        scaled_buf = np.empty((720, 1280, 3), dtype=np.uint8)
+        
+        while not stop_event.is_set():
+            try:
+                # Apply key presses between frames so state never changes mid-frame
+                while not self.key_queue.empty():
+                    key = self.key_queue.get_nowait()
+                    if key == ord('s'):  # S to start from welcome
+                        self.current_step = Step.WELCOME
+                    elif key == ord('r'):  # R to restart
+                        self.restart_application()
+                
+                # One clock read per iteration, shared by every handler
+                now = time.monotonic()
+                
+                # Get the freshest frame from the capture thread
+                frame = get_latest()
+                if frame is None:
+                    print("❌ Error: Could not read from camera")
+                    break
+                
+                # Resize frame for consistent processing; the camera is asked
+                # for 1280x720, so this is usually skipped. Detection only
+                # reads the frame - it is copied into a work buffer before
+                # anything is drawn (the capture thread's frame is shared)
+                if frame.shape[1] != 1280 or frame.shape[0] != 720:
+                    frame = resize(frame, (1280, 720), dst=scaled_buf, interpolation=cv2.INTER_AREA)
+                
+                # Shared RGB conversion done by the camera thread
+                self.rgb_frame = self.camera.rgb_frame
+                
+                # Get finger position FIRST (before any drawing), segmenting
+                # the body in parallel when a background is shown
+                segment = (self.selected_background is not None and
+                           self.current_step >= Step.BACKGROUND_SELECTION)
+                finger_pos, is_clicking, self.person_mask = process(
+                    frame, self.rgb_frame, segment=segment
+                )
+                
+                # The welcome screen mostly hides the camera, so while nothing
+                # changed, re-show the last composed frame. It is still
+                # recomposed every 0.1 s - longer than a camera frame (33 ms at
+                # 30 fps) - so the spinner animates and the 3 s timer runs
+                state_key = (self.current_step, self.clothing_step,
+                             self.selected_background, self.selected_clothing_item,
+                             finger_pos, is_clicking)
+                if (self.current_step == Step.WELCOME and state_key == self._last_state_key
+                        and now - self._last_compose_t < 0.1):
+                    frame = self._last_frame
+                else:
+                    # Private copy to draw on, from the next buffer in the ring
+                    work_buf = work_bufs[work_idx]
+                    work_idx = (work_idx + 1) % len(work_bufs)
+                    np.copyto(work_buf, frame)
+                    frame = work_buf
+                    
+                    # Process current step with modern animations
+                    frame = handlers[self.current_step](frame, finger_pos, is_clicking, now)
+                    
+                    # Draw modern finger cursor LAST (always on top)
+                    if finger_pos and self.gesture_detector.calibrated:
+                        frame = draw_cursor(frame, finger_pos)
+                    
+                    self._last_state_key = state_key
+                    self._last_frame = frame
+                    self._last_compose_t = now
+                
+                # Hand over to the display; waits while the display is behind
+                while not stop_event.is_set():
+                    try:
+                        put_display_frame(frame, timeout=0.01)
+                        break
+                    except queue.Full:
+                        pass
+                
+            except Exception as e:
+                print(f"❌ Main loop error: {e}")
+                break
+        
+        # Let the display loop exit too
+        self.stop_event.set()
+    
+    def handle_welcome_screen_modern(self, frame, finger_pos, is_clicking, now):
         """Display enhanced welcome screen with modern animations"""
         frame = self.ui.draw_welcome_screen(frame)
         
         # Auto-proceed to face detection after 3 seconds
-        if not hasattr(self, 'welcome_start_time'):
-            self.welcome_start_time = time.time()
+        if self.welcome_start_time is None:
+            self.welcome_start_time = now
         
-        elapsed = time.time() - self.welcome_start_time
+        elapsed = now - self.welcome_start_time
         if elapsed > 3.0:
-            self.current_step = "face_detection"
+            self.current_step = Step.FACE_DETECTION
             print("🎯 Starting face detection...")
         
         return frame
     
-    def handle_face_detection_modern(self, frame):
+    def handle_face_detection_modern(self, frame, finger_pos, is_clicking, now):
         """Handle face detection with modern UI animations"""
         # Use simple camera detection (returns boolean only)
         face_detected = self.camera.detect_face(frame)
@@ -164,16 +357,16 @@ class ProfessionalMakeoverApp:
             
             # Track detection time
             if self.face_detected_time == 0:
-                self.face_detected_time = time.time()
+                self.face_detected_time = now
             
             # Show modern progress with enhanced styling
-            elapsed = time.time() - self.face_detected_time
+            elapsed = now - self.face_detected_time
             progress = min(elapsed / 2.0, 1.0)  # 2 seconds to complete
             frame = self.ui.draw_detection_progress(frame, progress)
             
             # Auto-proceed when stable
             if elapsed > 2.0:
-                self.current_step = "background_selection"
+                self.current_step = Step.BACKGROUND_SELECTION
                 print("✅ Face detected! Moving to background selection...")
         else:
             self.face_detected_time = 0
@@ -182,45 +375,22 @@ class ProfessionalMakeoverApp:
         
         return frame
     
-    def handle_background_selection_modern(self, frame, finger_pos, is_clicking):
+    def handle_background_selection_modern(self, frame, finger_pos, is_clicking, now):
         """Handle background selection with hover progress animation"""
         # Apply current background if selected - PERSON ALWAYS STAYS VISIBLE
         if self.selected_background is not None:
-            frame = self.bg_engine.apply_background(frame, self.selected_background)
+            frame = self.bg_engine.apply_background(frame, self.selected_background, self.rgb_frame, self.person_mask,
+                                                   dst=frame)
         
         # Draw modern background popups FIRST
-        frame = self.popup_manager.draw_background_popups(frame, self.backgrounds)
+        frame = self.draw_popup_layer(frame, self.popup_manager.draw_background_popups, self.backgrounds)
         
         # Add modern hover highlight with PROGRESS ANIMATION
         if finger_pos:
             frame = self.popup_manager.highlight_popup_on_hover(frame, finger_pos)
             
             # Show hover progress (0-100% counting animation)
-            if hasattr(self.gesture_detector, 'last_pos') and self.gesture_detector.last_pos:
-                if hasattr(self.gesture_detector, 'hold_start_time') and self.gesture_detector.hold_start_time:
-                    current_time = time.time()
-                    hold_progress = ((current_time - self.gesture_detector.hold_start_time) / 
-                                   self.gesture_detector.hold_threshold)
-                    hold_progress = min(hold_progress, 1.0)
-                    
-                    if hold_progress > 0:
-                        # Draw progress animation (0-100%)
-                        percentage = int(hold_progress * 100)
-                        x, y = finger_pos
-                        
-                        # Progress ring around cursor
-                        progress_radius = int(40 + 20 * hold_progress)
-                        color = (0, 255, 255) if hold_progress < 0.8 else (0, 255, 0)
-                        cv2.circle(frame, (x, y), progress_radius, color, 4)
-                        
-                        # Progress text with counting animation
-                        cv2.putText(frame, f"{percentage}%", (x + 50, y - 30),
-                                   cv2.FONT_HERSHEY_SIMPLEX, 1.0, color, 3)
-                        
-                        # "SELECTING..." text
-                        if hold_progress > 0.1:
-                            cv2.putText(frame, "SELECTING...", (x + 50, y + 10),
-                                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+            frame = self.draw_hover_progress(frame, finger_pos, (0, 255, 255), "SELECTING...", now)
         
         # Modern instruction text with enhanced styling
         frame = self.ui.draw_instruction_text(frame, "Point and hold to select background", (640, 50))
@@ -234,364 +404,349 @@ class ProfessionalMakeoverApp:
                 self.bg_engine.change_background(self.selected_background)
                 print(f"Background selected: {os.path.basename(self.selected_background)}")
                 # Move to next step immediately
-                self.current_step = "clothing_selection"
+                self.current_step = Step.CLOTHING_SELECTION
         
         return frame
     
-    def handle_clothing_selection_modern(self, frame, finger_pos, is_clicking):
+    def handle_clothing_selection_modern(self, frame, finger_pos, is_clicking, now):
         """Handle multi-step clothing selection with proper flow and counting animation"""
         # Apply background first
         if self.selected_background:
-            frame = self.bg_engine.apply_background(frame, self.selected_background)
+            frame = self.bg_engine.apply_background(frame, self.selected_background, self.rgb_frame, self.person_mask,
+                                                   dst=frame)
         
         # Apply current clothing if selected
         if self.selected_clothing_type and self.selected_clothing_item is not None:
             frame = self.clothing_engine.apply_clothing_item(frame, self.selected_clothing_type, self.selected_clothing_item)
         
-        # STEP 1: Initial choice between T-shirt and Shirt
-        if not hasattr(self, 'clothing_step') or self.clothing_step == "initial":
-            self.clothing_step = "initial"
-            
-            # Show T-shirt (LEFT) and Shirt (RIGHT) options - FIXED ORDER
-            initial_options = ["tshirts", "shirts"]  # This will put tshirts on LEFT, shirts on RIGHT
-            frame = self.popup_manager.draw_initial_clothing_choice(frame, initial_options)
-            
-            # Add hover highlight with PROGRESS ANIMATION
+        # Only the current clothing sub-step runs
+        return self._clothing_handlers[self.clothing_step](frame, finger_pos, is_clicking, now)
+    
+    def _cloth_initial(self, frame, finger_pos, is_clicking, now):
+        """Initial choice between T-shirt and Shirt"""
+        # Show T-shirt (LEFT) and Shirt (RIGHT) options - FIXED ORDER
+        initial_options = ["tshirts", "shirts"]  # This will put tshirts on LEFT, shirts on RIGHT
+        frame = self.draw_popup_layer(frame, self.popup_manager.draw_initial_clothing_choice, initial_options)
+        
+        # Add hover highlight with PROGRESS ANIMATION
+        if finger_pos:
+            frame = self.popup_manager.highlight_popup_on_hover(frame, finger_pos)
+        
+            # Show hover progress (0-100% counting animation)
+            frame = self.draw_hover_progress(frame, finger_pos, (0, 255, 255), "SELECTING...", now)
+        
+        # Instructions
+        frame = self.ui.draw_instruction_text(frame, "Point and hold: T-shirt (LEFT) or Shirt (RIGHT)", (640, 50))
+        
+        # Check for click
+        if is_clicking:
+            selected_idx = self.popup_manager.check_popup_click(finger_pos)
+            if selected_idx is not None and selected_idx < len(initial_options):
+                self.selected_clothing_category = initial_options[selected_idx]
+        
+                if self.selected_clothing_category == "tshirts":
+                    self.clothing_step = ClothingStep.TSHIRT_SELECTION
+                    print("T-shirt category selected")
+                elif self.selected_clothing_category == "shirts":
+                    self.clothing_step = ClothingStep.SHIRT_SELECTION
+                    print("Shirt category selected")
+        
+        return frame
+    
+    def _cloth_tshirt(self, frame, finger_pos, is_clicking, now):
+        """T-shirt selection (final step for T-shirts)"""
+        # Get available T-shirts
+        available_tshirts = self.clothing_engine.get_available_clothing("tshirts")
+        
+        if available_tshirts:
+            frame = self.draw_popup_layer(frame, self.popup_manager.draw_clothing_item_popups, available_tshirts, "tshirts")
+        
             if finger_pos:
                 frame = self.popup_manager.highlight_popup_on_hover(frame, finger_pos)
-                
+        
                 # Show hover progress (0-100% counting animation)
-                if hasattr(self.gesture_detector, 'last_pos') and self.gesture_detector.last_pos:
-                    if hasattr(self.gesture_detector, 'hold_start_time') and self.gesture_detector.hold_start_time:
-                        current_time = time.time()
-                        hold_progress = ((current_time - self.gesture_detector.hold_start_time) / 
-                                       self.gesture_detector.hold_threshold)
-                        hold_progress = min(hold_progress, 1.0)
-                        
-                        if hold_progress > 0:
-                            # Draw progress animation (0-100%)
-                            percentage = int(hold_progress * 100)
-                            x, y = finger_pos
-                            
-                            # Progress ring around cursor
-                            progress_radius = int(40 + 20 * hold_progress)
-                            color = (0, 255, 255) if hold_progress < 0.8 else (0, 255, 0)
-                            cv2.circle(frame, (x, y), progress_radius, color, 4)
-                            
-                            # Progress text with counting animation
-                            cv2.putText(frame, f"{percentage}%", (x + 50, y - 30),
-                                       cv2.FONT_HERSHEY_SIMPLEX, 1.0, color, 3)
-                            
-                            # "SELECTING..." text
-                            if hold_progress > 0.1:
-                                cv2.putText(frame, "SELECTING...", (x + 50, y + 10),
-                                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
-            
-            # Instructions
-            frame = self.ui.draw_instruction_text(frame, "Point and hold: T-shirt (LEFT) or Shirt (RIGHT)", (640, 50))
-            
-            # Check for click
+                frame = self.draw_hover_progress(frame, finger_pos, (255, 0, 255), "SELECTING T-SHIRT...", now)  # Purple for T-shirts
+        
+            frame = self.ui.draw_instruction_text(frame, "Point and hold to select your T-shirt style", (640, 50))
+        
             if is_clicking:
                 selected_idx = self.popup_manager.check_popup_click(finger_pos)
-                if selected_idx is not None and selected_idx < len(initial_options):
-                    self.selected_clothing_category = initial_options[selected_idx]
-                    
-                    if self.selected_clothing_category == "tshirts":
-                        self.clothing_step = "tshirt_selection"
-                        print("T-shirt category selected")
-                    elif self.selected_clothing_category == "shirts":
-                        self.clothing_step = "shirt_selection"
-                        print("Shirt category selected")
-        
-        # STEP 2A: T-shirt selection (final step for T-shirts)
-        elif self.clothing_step == "tshirt_selection":
-            # Get available T-shirts
-            available_tshirts = self.clothing_engine.get_available_clothing("tshirts")
-            
-            if available_tshirts:
-                frame = self.popup_manager.draw_clothing_item_popups(frame, available_tshirts, "tshirts")
-                
-                if finger_pos:
-                    frame = self.popup_manager.highlight_popup_on_hover(frame, finger_pos)
-                    
-                    # Show hover progress (0-100% counting animation)
-                    if hasattr(self.gesture_detector, 'last_pos') and self.gesture_detector.last_pos:
-                        if hasattr(self.gesture_detector, 'hold_start_time') and self.gesture_detector.hold_start_time:
-                            current_time = time.time()
-                            hold_progress = ((current_time - self.gesture_detector.hold_start_time) / 
-                                           self.gesture_detector.hold_threshold)
-                            hold_progress = min(hold_progress, 1.0)
-                            
-                            if hold_progress > 0:
-                                # Draw progress animation (0-100%)
-                                percentage = int(hold_progress * 100)
-                                x, y = finger_pos
-                                
-                                # Progress ring around cursor
-                                progress_radius = int(40 + 20 * hold_progress)
-                                color = (255, 0, 255) if hold_progress < 0.8 else (0, 255, 0)  # Purple for T-shirts
-                                cv2.circle(frame, (x, y), progress_radius, color, 4)
-                                
-                                # Progress text with counting animation
-                                cv2.putText(frame, f"{percentage}%", (x + 50, y - 30),
-                                           cv2.FONT_HERSHEY_SIMPLEX, 1.0, color, 3)
-                                
-                                # "SELECTING..." text
-                                if hold_progress > 0.1:
-                                    cv2.putText(frame, "SELECTING T-SHIRT...", (x + 50, y + 10),
-                                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
-                
-                frame = self.ui.draw_instruction_text(frame, "Point and hold to select your T-shirt style", (640, 50))
-                
-                if is_clicking:
-                    selected_idx = self.popup_manager.check_popup_click(finger_pos)
-                    if selected_idx is not None and selected_idx < len(available_tshirts):
-                        self.selected_clothing_type = "tshirts"
-                        self.selected_clothing_item = selected_idx
-                        self.current_step = "complete"
-                        print(f"T-shirt {selected_idx + 1} selected - Going to complete")
-            else:
-                frame = self.ui.draw_instruction_text(frame, "No T-shirts available", (640, 50))
-        
-        # STEP 2B: Shirt selection
-        elif self.clothing_step == "shirt_selection":
-            # Get available shirts
-            available_shirts = self.clothing_engine.get_available_clothing("shirts")
-            
-            if available_shirts:
-                frame = self.popup_manager.draw_clothing_item_popups(frame, available_shirts, "shirts")
-                
-                if finger_pos:
-                    frame = self.popup_manager.highlight_popup_on_hover(frame, finger_pos)
-                    
-                    # Show hover progress (0-100% counting animation)
-                    if hasattr(self.gesture_detector, 'last_pos') and self.gesture_detector.last_pos:
-                        if hasattr(self.gesture_detector, 'hold_start_time') and self.gesture_detector.hold_start_time:
-                            current_time = time.time()
-                            hold_progress = ((current_time - self.gesture_detector.hold_start_time) / 
-                                           self.gesture_detector.hold_threshold)
-                            hold_progress = min(hold_progress, 1.0)
-                            
-                            if hold_progress > 0:
-                                # Draw progress animation (0-100%)
-                                percentage = int(hold_progress * 100)
-                                x, y = finger_pos
-                                
-                                # Progress ring around cursor
-                                progress_radius = int(40 + 20 * hold_progress)
-                                color = (255, 255, 0) if hold_progress < 0.8 else (0, 255, 0)  # Cyan for shirts
-                                cv2.circle(frame, (x, y), progress_radius, color, 4)
-                                
-                                # Progress text with counting animation
-                                cv2.putText(frame, f"{percentage}%", (x + 50, y - 30),
-                                           cv2.FONT_HERSHEY_SIMPLEX, 1.0, color, 3)
-                                
-                                # "SELECTING..." text
-                                if hold_progress > 0.1:
-                                    cv2.putText(frame, "SELECTING SHIRT...", (x + 50, y + 10),
-                                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
-                
-                frame = self.ui.draw_instruction_text(frame, "Point and hold to select your shirt style", (640, 50))
-                
-                if is_clicking:
-                    selected_idx = self.popup_manager.check_popup_click(finger_pos)
-                    if selected_idx is not None and selected_idx < len(available_shirts):
-                        self.selected_clothing_type = "shirts"
-                        self.selected_clothing_item = selected_idx
-                        self.clothing_step = "accessories_selection"
-                        print(f"Shirt {selected_idx + 1} selected - Moving to accessories")
-            else:
-                frame = self.ui.draw_instruction_text(frame, "No shirts available", (640, 50))
-        
-        # STEP 3: Accessories selection (only after shirt)
-        elif self.clothing_step == "accessories_selection":
-            # Show Blazer, Tie, and "No Blazer/Tie" options
-            accessory_options = ["blazers", "ties", "no_accessories"]
-            frame = self.popup_manager.draw_accessory_popups(frame, accessory_options)
-            
+                if selected_idx is not None and selected_idx < len(available_tshirts):
+                    self.selected_clothing_type = "tshirts"
+                    self.selected_clothing_item = selected_idx
+                    self.current_step = Step.COMPLETE
+                    print(f"T-shirt {selected_idx + 1} selected - Going to complete")
+        else:
+            frame = self.ui.draw_instruction_text(frame, "No T-shirts available", (640, 50))
+        
+        return frame
+    
+    def _cloth_shirt(self, frame, finger_pos, is_clicking, now):
+        """Shirt selection"""
+        # Get available shirts
+        available_shirts = self.clothing_engine.get_available_clothing("shirts")
+        
+        if available_shirts:
+            frame = self.draw_popup_layer(frame, self.popup_manager.draw_clothing_item_popups, available_shirts, "shirts")
+        
             if finger_pos:
                 frame = self.popup_manager.highlight_popup_on_hover(frame, finger_pos)
-                
+        
                 # Show hover progress (0-100% counting animation)
-                if hasattr(self.gesture_detector, 'last_pos') and self.gesture_detector.last_pos:
-                    if hasattr(self.gesture_detector, 'hold_start_time') and self.gesture_detector.hold_start_time:
-                        current_time = time.time()
-                        hold_progress = ((current_time - self.gesture_detector.hold_start_time) / 
-                                       self.gesture_detector.hold_threshold)
-                        hold_progress = min(hold_progress, 1.0)
-                        
-                        if hold_progress > 0:
-                            # Draw progress animation (0-100%)
-                            percentage = int(hold_progress * 100)
-                            x, y = finger_pos
-                            
-                            # Progress ring around cursor
-                            progress_radius = int(40 + 20 * hold_progress)
-                            color = (0, 165, 255) if hold_progress < 0.8 else (0, 255, 0)  # Orange for accessories
-                            cv2.circle(frame, (x, y), progress_radius, color, 4)
-                            
-                            # Progress text with counting animation
-                            cv2.putText(frame, f"{percentage}%", (x + 50, y - 30),
-                                       cv2.FONT_HERSHEY_SIMPLEX, 1.0, color, 3)
-                            
-                            # "SELECTING..." text
-                            if hold_progress > 0.1:
-                                cv2.putText(frame, "SELECTING ACCESSORY...", (x + 50, y + 10),
-                                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
-            
-            frame = self.ui.draw_instruction_text(frame, "Point and hold: Add Blazer, Tie, or keep shirt only?", (640, 50))
-            
+                frame = self.draw_hover_progress(frame, finger_pos, (255, 255, 0), "SELECTING SHIRT...", now)  # Cyan for shirts
+        
+            frame = self.ui.draw_instruction_text(frame, "Point and hold to select your shirt style", (640, 50))
+        
             if is_clicking:
                 selected_idx = self.popup_manager.check_popup_click(finger_pos)
-                if selected_idx is not None and selected_idx < len(accessory_options):
-                    selected_accessory = accessory_options[selected_idx]
-                    
-                    if selected_accessory == "no_accessories":
-                        # User wants only shirt - go to complete
-                        self.current_step = "complete"
-                        print("Shirt only selected - Going to complete")
-                    elif selected_accessory == "blazers":
-                        self.clothing_step = "blazer_selection"
-                        print("Blazer category selected")
-                    elif selected_accessory == "ties":
-                        self.clothing_step = "tie_selection"
-                        print("Tie category selected")
-        
-        # STEP 4A: Blazer selection
-        elif self.clothing_step == "blazer_selection":
-            available_blazers = self.clothing_engine.get_available_clothing("blazers")
+                if selected_idx is not None and selected_idx < len(available_shirts):
+                    self.selected_clothing_type = "shirts"
+                    self.selected_clothing_item = selected_idx
+                    self.clothing_step = ClothingStep.ACCESSORIES_SELECTION
+                    print(f"Shirt {selected_idx + 1} selected - Moving to accessories")
+        else:
+            frame = self.ui.draw_instruction_text(frame, "No shirts available", (640, 50))
+        
+        return frame
+    
+    def _cloth_accessories(self, frame, finger_pos, is_clicking, now):
+        """Accessories selection (only after shirt)"""
+        # Show Blazer, Tie, and "No Blazer/Tie" options
+        accessory_options = ["blazers", "ties", "no_accessories"]
+        frame = self.draw_popup_layer(frame, self.popup_manager.draw_accessory_popups, accessory_options)
+        
+        if finger_pos:
+            frame = self.popup_manager.highlight_popup_on_hover(frame, finger_pos)
+        
+            # Show hover progress (0-100% counting animation)
+            frame = self.draw_hover_progress(frame, finger_pos, (0, 165, 255), "SELECTING ACCESSORY...", now)  # Orange for accessories
+        
+        frame = self.ui.draw_instruction_text(frame, "Point and hold: Add Blazer, Tie, or keep shirt only?", (640, 50))
+        
+        if is_clicking:
+            selected_idx = self.popup_manager.check_popup_click(finger_pos)
+            if selected_idx is not None and selected_idx < len(accessory_options):
+                selected_accessory = accessory_options[selected_idx]
+        
+                if selected_accessory == "no_accessories":
+                    # User wants only shirt - go to complete
+                    self.current_step = Step.COMPLETE
+                    print("Shirt only selected - Going to complete")
+                elif selected_accessory == "blazers":
+                    self.clothing_step = ClothingStep.BLAZER_SELECTION
+                    print("Blazer category selected")
+                elif selected_accessory == "ties":
+                    self.clothing_step = ClothingStep.TIE_SELECTION
+                    print("Tie category selected")
+        
+        return frame
+    
+    def _cloth_blazer(self, frame, finger_pos, is_clicking, now):
+        """Blazer selection"""
+        available_blazers = self.clothing_engine.get_available_clothing("blazers")
+        
+        if available_blazers:
+            frame = self.draw_popup_layer(frame, self.popup_manager.draw_clothing_item_popups, available_blazers, "blazers")
+        
+            if finger_pos:
+                frame = self.popup_manager.highlight_popup_on_hover(frame, finger_pos)
+        
+                # Show hover progress (0-100% counting animation)
+                frame = self.draw_hover_progress(frame, finger_pos, (128, 0, 128), "SELECTING BLAZER...", now)  # Purple for blazers
+        
+            frame = self.ui.draw_instruction_text(frame, "Point and hold to select your blazer style", (640, 50))
+        
+            if is_clicking:
+                selected_idx = self.popup_manager.check_popup_click(finger_pos)
+                if selected_idx is not None and selected_idx < len(available_blazers):
+                    # Apply blazer
+                    self.apply_accessory("blazers", selected_idx)
+                    self.current_step = Step.COMPLETE
+                    print(f"Blazer {selected_idx + 1} selected - Going to complete")
+        else:
+            frame = self.ui.draw_instruction_text(frame, "No blazers available", (640, 50))
+        
+        return frame
+    
+    def _cloth_tie(self, frame, finger_pos, is_clicking, now):
+        """Tie selection"""
+        available_ties = self.clothing_engine.get_available_clothing("ties")
+        
+        if available_ties:
+            frame = self.draw_popup_layer(frame, self.popup_manager.draw_clothing_item_popups, available_ties, "ties")
+        
+            if finger_pos:
+                frame = self.popup_manager.highlight_popup_on_hover(frame, finger_pos)
+        
+                # Show hover progress (0-100% counting animation)
+                frame = self.draw_hover_progress(frame, finger_pos, (255, 0, 0), "SELECTING TIE...", now)  # Blue for ties
+        
+            frame = self.ui.draw_instruction_text(frame, "Point and hold to select your tie style", (640, 50))
+        
+            if is_clicking:
+                selected_idx = self.popup_manager.check_popup_click(finger_pos)
+                if selected_idx is not None and selected_idx < len(available_ties):
+                    # Apply tie
+                    self.apply_accessory("ties", selected_idx)
+                    self.current_step = Step.COMPLETE
+                    print(f"Tie {selected_idx + 1} selected - Going to complete")
+        else:
+            frame = self.ui.draw_instruction_text(frame, "No ties available", (640, 50))
+        
+        return frame
+    
+    def draw_popup_layer(self, frame, draw_popups, *args):
+        """Blend this step's popups from a cached atlas, composing it on first use"""
+        pm = self.popup_manager
+        
+        # Popups are static within a step - rebuild the layer when the step changes
+        step = (self.current_step, self.clothing_step)
+        if step != self._overlay_step:
+            self._overlay_cache.clear()
+            self._overlay_step = step
+        
+        cached = self._overlay_cache.get(draw_popups.__name__)
+        if cached is None:
+            # Draw onto a black layer: each popup region then holds the popup,
+            # or alpha * popup when popups are blended
+            layer = np.zeros_like(frame)
+            draw_popups(layer, *args)
             
-            if available_blazers:
-                frame = self.popup_manager.draw_clothing_item_popups(frame, available_blazers, "blazers")
-                
-                if finger_pos:
-                    frame = self.popup_manager.highlight_popup_on_hover(frame, finger_pos)
-                    
-                    # Show hover progress (0-100% counting animation)
-                    if hasattr(self.gesture_detector, 'last_pos') and self.gesture_detector.last_pos:
-                        if hasattr(self.gesture_detector, 'hold_start_time') and self.gesture_detector.hold_start_time:
-                            current_time = time.time()
-                            hold_progress = ((current_time - self.gesture_detector.hold_start_time) / 
-                                           self.gesture_detector.hold_threshold)
-                            hold_progress = min(hold_progress, 1.0)
-                            
-                            if hold_progress > 0:
-                                # Draw progress animation (0-100%)
-                                percentage = int(hold_progress * 100)
-                                x, y = finger_pos
-                                
-                                # Progress ring around cursor
-                                progress_radius = int(40 + 20 * hold_progress)
-                                color = (128, 0, 128) if hold_progress < 0.8 else (0, 255, 0)  # Purple for blazers
-                                cv2.circle(frame, (x, y), progress_radius, color, 4)
-                                
-                                # Progress text with counting animation
-                                cv2.putText(frame, f"{percentage}%", (x + 50, y - 30),
-                                           cv2.FONT_HERSHEY_SIMPLEX, 1.0, color, 3)
-                                
-                                # "SELECTING..." text
-                                if hold_progress > 0.1:
-                                    cv2.putText(frame, "SELECTING BLAZER...", (x + 50, y + 10),
-                                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
-                
-                frame = self.ui.draw_instruction_text(frame, "Point and hold to select your blazer style", (640, 50))
-                
-                if is_clicking:
-                    selected_idx = self.popup_manager.check_popup_click(finger_pos)
-                    if selected_idx is not None and selected_idx < len(available_blazers):
-                        # Apply blazer
-                        self.apply_accessory("blazers", selected_idx)
-                        self.current_step = "complete"
-                        print(f"Blazer {selected_idx + 1} selected - Going to complete")
-            else:
-                frame = self.ui.draw_instruction_text(frame, "No blazers available", (640, 50))
-        
-        # STEP 4B: Tie selection  
-        elif self.clothing_step == "tie_selection":
-            available_ties = self.clothing_engine.get_available_clothing("ties")
+            # Pack the popup rectangles into one small contiguous atlas,
+            # stacked vertically, instead of keeping the sparse full layer
+            rects = pm.popup_data[:, 4:8].tolist()
+            atlas_h = sum(y2 - y1 for _, y1, _, y2 in rects)
+            atlas_w = max((x2 - x1 for x1, _, x2, _ in rects), default=0)
+            atlas = np.zeros((atlas_h, atlas_w, 3), dtype=np.uint8)
+            tiles = []
+            top = 0
+            for x1, y1, x2, y2 in rects:
+                tile = atlas[top:top + y2 - y1, :x2 - x1]
+                tile[:] = layer[y1:y2, x1:x2]
+                tiles.append((slice(y1, y2), slice(x1, x2), tile))
+                top += y2 - y1
             
-            if available_ties:
-                frame = self.popup_manager.draw_clothing_item_popups(frame, available_ties, "ties")
-                
-                if finger_pos:
-                    frame = self.popup_manager.highlight_popup_on_hover(frame, finger_pos)
-                    
-                    # Show hover progress (0-100% counting animation)
-                    if hasattr(self.gesture_detector, 'last_pos') and self.gesture_detector.last_pos:
-                        if hasattr(self.gesture_detector, 'hold_start_time') and self.gesture_detector.hold_start_time:
-                            current_time = time.time()
-                            hold_progress = ((current_time - self.gesture_detector.hold_start_time) / 
-                                           self.gesture_detector.hold_threshold)
-                            hold_progress = min(hold_progress, 1.0)
-                            
-                            if hold_progress > 0:
-                                # Draw progress animation (0-100%)
-                                percentage = int(hold_progress * 100)
-                                x, y = finger_pos
-                                
-                                # Progress ring around cursor
-                                progress_radius = int(40 + 20 * hold_progress)
-                                color = (255, 0, 0) if hold_progress < 0.8 else (0, 255, 0)  # Blue for ties
-                                cv2.circle(frame, (x, y), progress_radius, color, 4)
-                                
-                                # Progress text with counting animation
-                                cv2.putText(frame, f"{percentage}%", (x + 50, y - 30),
-                                           cv2.FONT_HERSHEY_SIMPLEX, 1.0, color, 3)
-                                
-                                # "SELECTING..." text
-                                if hold_progress > 0.1:
-                                    cv2.putText(frame, "SELECTING TIE...", (x + 50, y + 10),
-                                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
-                
-                frame = self.ui.draw_instruction_text(frame, "Point and hold to select your tie style", (640, 50))
-                
-                if is_clicking:
-                    selected_idx = self.popup_manager.check_popup_click(finger_pos)
-                    if selected_idx is not None and selected_idx < len(available_ties):
-                        # Apply tie
-                        self.apply_accessory("ties", selected_idx)
-                        self.current_step = "complete"
-                        print(f"Tie {selected_idx + 1} selected - Going to complete")
-            else:
-                frame = self.ui.draw_instruction_text(frame, "No ties available", (640, 50))
+            cached = (atlas, tiles, pm.popup_data, pm.current_popup_type)
+            
+            # Rebuild next frame while thumbnails are still loading
+            if not pm.thumbnails_pending:
+                self._overlay_cache[draw_popups.__name__] = cached
+        
+        _, tiles, pm.popup_data, pm.current_popup_type = cached
+        
+        # Only touch the popup rectangles
+        if pm.popup_alpha >= pm.opaque_alpha:
+            for rows, cols, tile in tiles:
+                frame[rows, cols] = tile
+        else:
+            # frame * (1 - alpha) + alpha * popup
+            beta = 1 - pm.popup_alpha
+            for rows, cols, tile in tiles:
+                roi = frame[rows, cols]
+                cv2.scaleAdd(roi, beta, tile, dst=roi)
+        
+        return frame
+    
+    def draw_static_ui(self, frame, key, draw):
+        """Apply draw(frame) from a cached per-pixel layer while key is unchanged
+        
+        draw may only blend and draw on the frame, so its effect on each pixel
+        is frame * scale + offset; both are recovered once by drawing on an
+        all-black and an all-white frame
+        """
+        if key != self._ui_layer_key:
+            black = draw(np.zeros_like(frame))
+            white = draw(np.full_like(frame, 255))
+            scale = cv2.subtract(white, black)  # 0-255 weight of the frame
+            changed = np.any((scale != 255) | (black != 0), axis=2)
+            
+            # Bands of consecutive touched rows, each cropped to its columns
+            rows = np.flatnonzero(changed.any(axis=1))
+            bands = np.split(rows, np.flatnonzero(np.diff(rows) > 1) + 1) if len(rows) else []
+            layer = []
+            for band in bands:
+                y1, y2 = band[0], band[-1] + 1
+                cols = np.flatnonzero(changed[y1:y2].any(axis=0))
+                x1, x2 = cols[0], cols[-1] + 1
+                layer.append((slice(y1, y2), slice(x1, x2),
+                              scale[y1:y2, x1:x2].copy(), black[y1:y2, x1:x2].copy()))
+            
+            self._ui_layer_key = key
+            self._ui_layer = layer
+        
+        for rows, cols, scale, offset in self._ui_layer:
+            roi = frame[rows, cols]
+            cv2.multiply(roi, scale, dst=roi, scale=1.0 / 255)
+            cv2.add(roi, offset, dst=roi)
+        
+        return frame
+    
+    def draw_hover_progress(self, frame, finger_pos, color, label, now):
+        """Draw the hold-to-select progress ring, percentage and label"""
+        gd = self.gesture_detector
+        if gd.last_pos is None or gd.hold_start_time is None:
+            return frame
+        
+        hold_progress = (now - gd.hold_start_time) / gd.hold_threshold
+        hold_progress = min(hold_progress, 1.0)
+        
+        if hold_progress > 0:
+            # Draw progress animation (0-100%)
+            percentage = int(hold_progress * 100)
+            x, y = finger_pos
+            
+            # Progress ring around cursor, green when almost done
+            if hold_progress >= 0.8:
+                color = (0, 255, 0)
+            progress_radius = int(40 + 20 * hold_progress)
+            frame = self.ui.draw_cached_ring(frame, (x, y), progress_radius, color, 4)
+            
+            # Progress text with counting animation (pre-rendered glyphs)
+            frame = self.ui.draw_cached_text(frame, f"{percentage}%", (x + 50, y - 30),
+                                             cv2.FONT_HERSHEY_SIMPLEX, 1.0, color, 3)
+            
+            # "SELECTING..." text
+            if hold_progress > 0.1:
+                frame = self.ui.draw_cached_text(frame, label, (x + 50, y + 10),
+                                                 cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
         
         return frame
     
     def apply_accessory(self, accessory_type, item_index):
         """Apply accessory (blazer or tie) on top of shirt"""
         # Store accessory information
-        if not hasattr(self, 'selected_accessories'):
-            self.selected_accessories = {}
-        
         self.selected_accessories[accessory_type] = item_index
         print(f"Applied {accessory_type}: {item_index}")
     
-    def handle_complete_screen_modern(self, frame, finger_pos, is_clicking):
+    def handle_complete_screen_modern(self, frame, finger_pos, is_clicking, now):
         """Show final result with all applied clothing"""
         # Apply background
         if self.selected_background:
-            frame = self.bg_engine.apply_background(frame, self.selected_background)
+            frame = self.bg_engine.apply_background(frame, self.selected_background, self.rgb_frame, self.person_mask,
+                                                   dst=frame)
         
         # Apply main clothing (shirt or t-shirt)
         if self.selected_clothing_type and self.selected_clothing_item is not None:
             frame = self.clothing_engine.apply_clothing_item(frame, self.selected_clothing_type, self.selected_clothing_item)
         
-        # Apply accessories if any (blazer, tie)
-        if hasattr(self, 'selected_accessories'):
-            for accessory_type, item_index in self.selected_accessories.items():
+        # Apply accessories if any (blazer, tie) - skipped for "Shirt Only"
+        accessories = self.selected_accessories
+        if accessories:
+            for accessory_type, item_index in accessories.items():
                 frame = self.clothing_engine.apply_clothing_item(frame, accessory_type, item_index)
         
-        # Draw modern completion overlay
-        frame = self.ui.draw_completion_screen(frame)
-        
-        # Add professional watermark
-        frame = self.ui.add_professional_watermark(frame)
+        # Draw modern completion overlay and professional watermark - both
+        # are the same every frame, so they come from a cached layer
+        frame = self.draw_static_ui(
+            frame, (self.current_step, frame.shape),
+            lambda f: self.ui.add_professional_watermark(self.ui.draw_completion_screen(f))
+        )
         
         # Save screenshot option with modern feedback
         if is_clicking and finger_pos:
             self.save_result(frame)
             # Show save notification
-            frame = self.ui.draw_notification(frame, "Screenshot saved successfully!", "success")
+            frame = self.ui.draw_hud(frame, notification=("Screenshot saved successfully!", "success"))
         
         return frame
     
@@ -599,37 +754,51 @@ class ProfessionalMakeoverApp:
         """Save the final result with timestamp"""
         timestamp = int(time.time())
         filename = f"professional_makeover_{timestamp}.jpg"
-        cv2.imwrite(filename, frame)
-        print(f"📸 Result saved as {filename}")
+        try:
+            # Copy - the caller keeps drawing on frame
+            self._save_queue.put_nowait((frame.copy(), filename))
+        except queue.Full:
+            print("⚠️ Still saving earlier screenshots - skipped this one")
+    
+    def _writer_loop(self):
+        """Writer thread - JPEG encode and disk write for saved results"""
+        while True:
+            item = self._save_queue.get()
+            if item is None:
+                break
+            frame, filename = item
+            cv2.imwrite(filename, frame)
+            print(f"📸 Result saved as {filename}")
     
     def restart_application(self):
         """Restart the application with modern feedback"""
-        self.current_step = "welcome"
+        self.current_step = Step.WELCOME
         self.face_detected_time = 0
         self.selected_background = None
         self.selected_clothing_type = None
         self.selected_clothing_item = None
         
         # Reset clothing selection states
-        if hasattr(self, 'clothing_step'):
-            delattr(self, 'clothing_step')
-        if hasattr(self, 'selected_clothing_category'):
-            delattr(self, 'selected_clothing_category')
-        if hasattr(self, 'selected_accessories'):
-            delattr(self, 'selected_accessories')
+        self.clothing_step = ClothingStep.INITIAL
+        self.selected_clothing_category = None
+        self.selected_accessories = {}
         
         # Reset background learning
         if hasattr(self.bg_engine, 'reset_background_learning'):
             self.bg_engine.reset_background_learning()
         
         # Clear timing attributes
-        if hasattr(self, 'welcome_start_time'):
-            delattr(self, 'welcome_start_time')
+        self.welcome_start_time = None
         
         print("Application restarted with modern interface!")
     
     def cleanup(self):
         """Clean up resources"""
+        # Let pending screenshots finish writing
+        self._save_queue.put(None)
+        self._writer.join(timeout=5.0)
+        
+        self.pipeline.release()
         self.camera.release()
         cv2.destroyAllWindows()
         print("Modern AI Professional Makeover closed successfully!")
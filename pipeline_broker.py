@@ -0,0 +1,31 @@
+"""
+Pipeline Broker - Runs hand tracking and body segmentation side by side
+"""
+
+class PipelineBroker:
+    def __init__(self, gesture_detector, bg_engine):
+        """Share one RGB frame between the MediaPipe models each tick"""
+        self.gesture_detector = gesture_detector
+        self.bg_engine = bg_engine
+        
+        print("MediaPipe pipeline broker ready!")
+
+    def process(self, frame, rgb_frame=None, segment=False):
+        """Run hand tracking (and segmentation if requested) on one frame
+        
+        Returns (finger_pos, is_clicking, person_mask); person_mask is None
+        when segmentation was not requested or no mask is ready yet
+        """
+        # Segmentation runs on the background engine's worker thread (and
+        # MediaPipe releases the GIL), so it overlaps with hand tracking
+        person_mask = None
+        if segment:
+            person_mask = self.bg_engine.request_person_mask(frame, rgb_frame)
+        
+        finger_pos, is_clicking = self.gesture_detector.detect_finger_click(frame, rgb_frame)
+        
+        return finger_pos, is_clicking, person_mask
+
+    def release(self):
+        """Stop the background engine's segmentation worker"""
+        self.bg_engine.stop_mask_worker()
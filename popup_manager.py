@@ -6,8 +6,11 @@ import cv2
 import numpy as np
 import os
 import math
+from concurrent.futures import ThreadPoolExecutor
 
 class PopupManager:
+    MAX_POPUPS = 8  # Most popups any step shows (4 left + 4 right)
+    
     def __init__(self):
         """Initialize smart popup system with improved click detection"""
         # Popup layout configuration
@@ -15,6 +18,8 @@ class PopupManager:
         self.popup_margin = 20
         self.border_thickness = 3
         self.corner_radius = 20
+        self.popup_alpha = 0.95  # Popup opacity over the camera frame
+        self.opaque_alpha = 0.9  # At or above this opacity popups are copied, not blended
         
         # EXPANDED CLICK AREAS - This is the key fix
         self.click_padding = 30  # Extra clickable area around each popup
@@ -32,46 +37,90 @@ class PopupManager:
             'click_area': (0, 255, 0)  # Green for click area visualization
         }
         
-        # Popup positions
-        self.left_positions = []
-        self.right_positions = []
-        self.popup_data = {}
+        # Popup positions, recomputed only when the frame size changes
+        self.left_positions = ()
+        self.right_positions = ()
+        self._positions_size = None
         self.current_popup_type = ""
         
+        # One int32 row per drawn popup, in draw order:
+        # click bounds (x1, y1, x2, y2), visual bounds (x1, y1, x2, y2), index
+        self.reset_popup_data()
+        
+        # Finished popups by (popup type, index, label, source), for the
+        # current popup type only - see get_cached_popup
+        self._popup_cache = {}
+        self._popup_cache_type = None
+        
+        # Popup-sized thumbnails by source image path (kept across steps);
+        # files are decoded on a worker pool, see request_thumbnail
+        self._thumb_cache = {}
+        self._thumb_futures = {}
+        self._thumb_pool = ThreadPoolExecutor(max_workers=2)
+        self.thumbnails_pending = False  # Last draw showed placeholders for loading thumbnails
+        
+        # Rendered labels (shadow + text) by label text, see get_label_sprite
+        self._label_cache = {}
+        
+        # Popup content is resized into this scratch before being copied in
+        self._content_scratch = np.empty((self.popup_size[1] - 40, self.popup_size[0] - 20, 3), dtype=np.uint8)
+        
+        # Every popup starts from the same rounded panel - build it once
+        self._rounded_bg = self.create_rounded_rectangle(
+            self.popup_size[0], self.popup_size[1] + 40, self.corner_radius, self.colors['primary']
+        )
+        
+        # Icons never change, so draw them once - see create_category_icon
+        self._icon_cache = {
+            category: self._draw_category_icon(category)
+            for category in ('shirts', 'tshirts', 'blazers', 'ties', 'default')
+        }
+        self._icon_cache['no_accessories'] = self._draw_no_accessories_icon()
+        
         print("Smart popup manager with enhanced click detection initialized!")
     
     def calculate_positions(self, frame_width, frame_height):
         """Calculate popup positions based on screen size"""
-        self.left_positions = []
-        self.right_positions = []
+        if self._positions_size == (frame_width, frame_height):
+            return
+        self._positions_size = (frame_width, frame_height)
         
-        # Calculate positions for left side (4 popups)
-        left_x = self.popup_margin + self.click_padding  # Account for click padding
         start_y = (frame_height - 4 * self.popup_size[1] - 3 * self.popup_margin) // 2
+        rows_y = [start_y + i * (self.popup_size[1] + self.popup_margin) for i in range(4)]
         
-        for i in range(4):
-            y = start_y + i * (self.popup_size[1] + self.popup_margin)
-            self.left_positions.append((left_x, y))
+        # Calculate positions for left side (4 popups)
+        left_x = self.popup_margin + self.click_padding  # Account for click padding
+        self.left_positions = tuple((left_x, y) for y in rows_y)
         
         # Calculate positions for right side (4 popups)
         right_x = frame_width - self.popup_size[0] - self.popup_margin - self.click_padding
-        
-        for i in range(4):
-            y = start_y + i * (self.popup_size[1] + self.popup_margin)
-            self.right_positions.append((right_x, y))
+        self.right_positions = tuple((right_x, y) for y in rows_y)
 
+    def get_cached_popup(self, key, build):
+        """Return the finished popup for key, calling build() only on a miss"""
+        # Popups of other types belong to another step - drop them
+        if self.current_popup_type != self._popup_cache_type:
+            self._popup_cache.clear()
+            self._popup_cache_type = self.current_popup_type
+        
+        popup = self._popup_cache.get(key)
+        if popup is None:
+            # Popups showing a placeholder for a loading thumbnail are not kept
+            pending = self.thumbnails_pending
+            self.thumbnails_pending = False
+            popup = build()
+            if not self.thumbnails_pending:
+                self._popup_cache[key] = popup
+            self.thumbnails_pending |= pending
+        return popup
+    
     def draw_initial_clothing_choice(self, frame, categories):
         """Draw initial T-shirt vs Shirt choice - T-shirt LEFT, Shirt RIGHT"""
         h, w = frame.shape[:2]
         self.calculate_positions(w, h)
         self.current_popup_type = "initial_choice"
-        self.popup_data = {}
-        
-        # Category icons
-        category_icons = {
-            'tshirts': self.create_category_icon('tshirts'),
-            'shirts': self.create_category_icon('shirts')
-        }
+        self.reset_popup_data()
+        self.thumbnails_pending = False
         
         # FIXED: T-shirts on LEFT (index 0), Shirts on RIGHT (index 1)
         positions = [self.left_positions[1], self.right_positions[1]]  # Use middle positions
@@ -81,11 +130,12 @@ class PopupManager:
                 break
             
             pos = positions[i]
-            popup_id = f"initial_{i}"
-            icon = category_icons.get(category, self.create_category_icon('default'))
+            icon = self.create_category_icon(category)
+            label = category.replace('_', ' ').title()
             
-            popup = self.create_styled_popup(icon, category.replace('_', ' ').title())
-            frame = self.overlay_popup_with_click_area(frame, popup, pos, popup_id)
+            popup = self.get_cached_popup((self.current_popup_type, i, label, category),
+                                          lambda: self.create_styled_popup(icon, label))
+            frame = self.overlay_popup_with_click_area(frame, popup, pos, i)
         
         return frame
     
@@ -94,9 +144,10 @@ class PopupManager:
         h, w = frame.shape[:2]
         self.calculate_positions(w, h)
         self.current_popup_type = "accessories"
-        self.popup_data = {}
+        self.reset_popup_data()
+        self.thumbnails_pending = False
         
-        # Create icons for accessories
+        # Icons for accessories
         accessory_icons = {
             'blazers': self.create_category_icon('blazers'),
             'ties': self.create_category_icon('ties'),
@@ -115,7 +166,6 @@ class PopupManager:
                 break
             
             pos = positions[i]
-            popup_id = f"accessory_{i}"
             icon = accessory_icons.get(accessory, self.create_category_icon('default'))
             
             # Create labels
@@ -126,14 +176,19 @@ class PopupManager:
             }
             label = labels.get(accessory, accessory.title())
             
-            popup = self.create_styled_popup(icon, label)
-            frame = self.overlay_popup_with_click_area(frame, popup, pos, popup_id)
+            popup = self.get_cached_popup((self.current_popup_type, i, label, accessory),
+                                          lambda: self.create_styled_popup(icon, label))
+            frame = self.overlay_popup_with_click_area(frame, popup, pos, i)
         
         return frame
 
     def create_no_accessories_icon(self):
+        """Icon for 'no accessories' option (shared - do not draw on it)"""
+        return self._icon_cache['no_accessories']
+    
+    def _draw_no_accessories_icon(self):
         """Create icon for 'no accessories' option"""
-        icon = np.ones((self.popup_size[1], self.popup_size[0], 3), dtype=np.uint8) * 250
+        icon = np.full((self.popup_size[1], self.popup_size[0], 3), 250, dtype=np.uint8)
         
         center_x, center_y = self.popup_size[0] // 2, self.popup_size[1] // 2
         
@@ -156,7 +211,8 @@ class PopupManager:
         h, w = frame.shape[:2]
         self.calculate_positions(w, h)
         self.current_popup_type = "bg"
-        self.popup_data = {}  # Clear previous popup data
+        self.reset_popup_data()  # Clear previous popup data
+        self.thumbnails_pending = False
         
         all_positions = self.left_positions + self.right_positions
         
@@ -165,18 +221,12 @@ class PopupManager:
                 break
             
             pos = all_positions[i]
-            popup_id = f"bg_{i}"
-            
-            # Load background thumbnail or create placeholder
-            if os.path.exists(bg_path):
-                bg_thumb = cv2.imread(bg_path)
-                bg_thumb = cv2.resize(bg_thumb, self.popup_size)
-            else:
-                bg_thumb = self.create_background_placeholder(i)
             
-            # Create and draw popup
-            popup = self.create_styled_popup(bg_thumb, f"Background {i+1}")
-            frame = self.overlay_popup_with_click_area(frame, popup, pos, popup_id)
+            # Create (or reuse) and draw popup
+            label = f"Background {i+1}"
+            popup = self.get_cached_popup((self.current_popup_type, i, label, bg_path),
+                                          lambda: self.create_styled_popup(self.load_background_thumbnail(bg_path, i), label))
+            frame = self.overlay_popup_with_click_area(frame, popup, pos, i)
         
         return frame
     
@@ -185,15 +235,8 @@ class PopupManager:
         h, w = frame.shape[:2]
         self.calculate_positions(w, h)
         self.current_popup_type = "category"
-        self.popup_data = {}
-        
-        # Category icons
-        category_icons = {
-            'shirts': self.create_category_icon('shirts'),
-            'tshirts': self.create_category_icon('tshirts'),
-            'blazers': self.create_category_icon('blazers'),
-            'ties': self.create_category_icon('ties')
-        }
+        self.reset_popup_data()
+        self.thumbnails_pending = False
         
         all_positions = self.left_positions + self.right_positions
         
@@ -202,11 +245,12 @@ class PopupManager:
                 break
             
             pos = all_positions[i]
-            popup_id = f"category_{i}"
-            icon = category_icons.get(category, self.create_category_icon('default'))
+            icon = self.create_category_icon(category)
+            label = category.replace('_', ' ').title()
             
-            popup = self.create_styled_popup(icon, category.replace('_', ' ').title())
-            frame = self.overlay_popup_with_click_area(frame, popup, pos, popup_id)
+            popup = self.get_cached_popup((self.current_popup_type, i, label, category),
+                                          lambda: self.create_styled_popup(icon, label))
+            frame = self.overlay_popup_with_click_area(frame, popup, pos, i)
         
         return frame
     
@@ -215,7 +259,8 @@ class PopupManager:
         h, w = frame.shape[:2]
         self.calculate_positions(w, h)
         self.current_popup_type = "item"
-        self.popup_data = {}
+        self.reset_popup_data()
+        self.thumbnails_pending = False
         
         all_positions = self.left_positions + self.right_positions
         
@@ -224,25 +269,92 @@ class PopupManager:
                 break
             
             pos = all_positions[i]
-            popup_id = f"item_{i}"
-            
-            # Load actual clothing image
-            if isinstance(item, dict) and 'image' in item:
-                clothing_thumbnail = self.create_clothing_thumbnail(item['image'])
-            elif isinstance(item, str):
-                # If item is just a path string
-                clothing_img = cv2.imread(item, cv2.IMREAD_UNCHANGED)
-                clothing_thumbnail = self.create_clothing_thumbnail(clothing_img)
-            else:
-                clothing_thumbnail = self.create_placeholder_thumbnail()
             
             # Create popup with real clothing image
-            popup = self.create_styled_popup(clothing_thumbnail, f"{clothing_type.capitalize()} {i+1}")
-            frame = self.overlay_popup_with_click_area(frame, popup, pos, popup_id)
+            label = f"{clothing_type.capitalize()} {i+1}"
+            source = item.get('path') if isinstance(item, dict) else item if isinstance(item, str) else None
+            popup = self.get_cached_popup((self.current_popup_type, i, label, source),
+                                          lambda: self.create_styled_popup(self.load_clothing_thumbnail(item), label))
+            frame = self.overlay_popup_with_click_area(frame, popup, pos, i)
         
         return frame
     
-    def overlay_popup_with_click_area(self, frame, popup, position, popup_id):
+    def request_thumbnail(self, path, read):
+        """Return the thumbnail for path, or None while read(path) runs on the worker pool
+        
+        Sets thumbnails_pending while the file is still loading; None is also
+        returned (without pending) when read found no usable image
+        """
+        thumb = self._thumb_cache.get(path)
+        if thumb is not None:
+            return thumb
+        
+        future = self._thumb_futures.get(path)
+        if future is None:
+            future = self._thumb_pool.submit(read, path)
+            self._thumb_futures[path] = future
+        if not future.done():
+            self.thumbnails_pending = True
+            return None
+        
+        del self._thumb_futures[path]
+        thumb = future.result()
+        if thumb is not None:
+            self._thumb_cache[path] = thumb
+        return thumb
+    
+    def prefetch_thumbnails(self, paths, read=None):
+        """Start decoding thumbnails ahead of the step that shows them"""
+        for path in paths:
+            if path not in self._thumb_cache and path not in self._thumb_futures:
+                self._thumb_futures[path] = self._thumb_pool.submit(
+                    read or self._read_background_thumbnail, path
+                )
+    
+    def _read_background_thumbnail(self, bg_path):
+        """Worker: decode and shrink a background image (None if missing)"""
+        if not os.path.exists(bg_path):
+            return None
+        bg_thumb = cv2.imread(bg_path)
+        if bg_thumb is None:
+            return None
+        return cv2.resize(bg_thumb, self.popup_size)
+    
+    def _read_clothing_thumbnail(self, path):
+        """Worker: decode a clothing image into a thumbnail (None if unreadable)"""
+        clothing_img = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+        if clothing_img is None:
+            return None
+        return self.create_clothing_thumbnail(clothing_img)
+    
+    def load_background_thumbnail(self, bg_path, index):
+        """Load background thumbnail or create placeholder"""
+        thumb = self.request_thumbnail(bg_path, self._read_background_thumbnail)
+        if thumb is not None:
+            return thumb
+        return self.create_background_placeholder(index)
+    
+    def load_clothing_thumbnail(self, item):
+        """Load actual clothing image for an item (dict with 'image' or path string)"""
+        if isinstance(item, dict) and 'image' in item:
+            return self.create_clothing_thumbnail(item['image'])
+        elif isinstance(item, str):
+            # If item is just a path string - decoded once, off this thread
+            thumb = self.request_thumbnail(item, self._read_clothing_thumbnail)
+            if thumb is not None:
+                return thumb
+        return self.create_placeholder_thumbnail()
+    
+    def reset_popup_data(self):
+        """Start an empty popup table for the next draw
+        
+        A fresh table is allocated so popup_data handed out earlier (e.g. to
+        cached overlay layers) is never overwritten
+        """
+        self._popup_table = np.empty((self.MAX_POPUPS, 9), dtype=np.int32)
+        self.popup_data = self._popup_table[:0]
+    
+    def overlay_popup_with_click_area(self, frame, popup, position, index):
         """Overlay popup with expanded clickable area and visual feedback"""
         x, y = position
         ph, pw = popup.shape[:2]
@@ -259,70 +371,70 @@ class PopupManager:
         click_y2 = min(fh, y + ph + self.click_padding)
         
         # Store popup data for click detection with EXPANDED bounds
-        self.popup_data[popup_id] = {
-            'position': position,
-            'size': (pw, ph),
-            'click_bounds': (click_x1, click_y1, click_x2, click_y2),  # Expanded clickable area
-            'visual_bounds': (x, y, x + pw, y + ph),  # Visual popup area
-            'index': int(popup_id.split('_')[1])
-        }
+        n = len(self.popup_data)
+        self._popup_table[n] = (click_x1, click_y1, click_x2, click_y2,  # Expanded clickable area
+                                x, y, x + pw, y + ph,  # Visual popup area
+                                index)
+        self.popup_data = self._popup_table[:n + 1]
         
         # Clickable area is invisible - no visual indicators needed
         
         # Blend popup with frame
         roi = frame[y:y + ph, x:x + pw]
         
-        # Create alpha mask for smooth blending
-        alpha = 0.95
-        blended = cv2.addWeighted(roi, 1 - alpha, popup, alpha, 0)
-        frame[y:y + ph, x:x + pw] = blended
+        # Nearly opaque popups look the same copied straight in
+        alpha = self.popup_alpha
+        if alpha >= self.opaque_alpha:
+            roi[:] = popup
+        else:
+            cv2.addWeighted(roi, 1 - alpha, popup, alpha, 0, dst=roi)
         
         return frame
     
+    def find_popup_at(self, finger_pos):
+        """Return the popup_data row of the first popup whose EXPANDED click area contains finger_pos"""
+        x, y = finger_pos
+        bounds = self.popup_data
+        hits = (x >= bounds[:, 0]) & (x <= bounds[:, 2]) & (y >= bounds[:, 1]) & (y <= bounds[:, 3])
+        if not hits.any():
+            return None
+        return int(np.argmax(hits))
+    
     def check_popup_click(self, finger_pos):
         """Enhanced click detection using expanded click areas"""
         if finger_pos is None:
             return None
         
-        x, y = finger_pos
-        
         # Check all popups using EXPANDED click bounds
-        for popup_id, data in self.popup_data.items():
-            click_bounds = data['click_bounds']
-            if (click_bounds[0] <= x <= click_bounds[2] and 
-                click_bounds[1] <= y <= click_bounds[3]):
-                
-                print(f"Finger detected in {popup_id} click area at ({x}, {y})")
-                return data['index']
+        row = self.find_popup_at(finger_pos)
+        if row is None:
+            return None
         
-        return None
+        index = int(self.popup_data[row, 8])
+        print(f"Finger detected in {self.current_popup_type}_{index} click area at ({finger_pos[0]}, {finger_pos[1]})")
+        return index
     
     def highlight_popup_on_hover(self, frame, finger_pos):
         """Highlight popup when finger is in clickable area"""
         if finger_pos is None:
             return frame
         
-        x, y = finger_pos
-        
         # Find which popup is being hovered
-        for popup_id, data in self.popup_data.items():
-            click_bounds = data['click_bounds']
-            if (click_bounds[0] <= x <= click_bounds[2] and 
-                click_bounds[1] <= y <= click_bounds[3]):
-                
-                # Draw bright highlight around the visual popup area
-                visual_bounds = data['visual_bounds']
-                cv2.rectangle(frame, 
-                             (visual_bounds[0] - 5, visual_bounds[1] - 5),
-                             (visual_bounds[2] + 5, visual_bounds[3] + 5),
-                             self.colors['hover'], 4)
-                
-                # Add "HOVERING" text
-                cv2.putText(frame, "HOVERING", 
-                           (visual_bounds[0], visual_bounds[1] - 15),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, self.colors['hover'], 2)
-                
-                break
+        row = self.find_popup_at(finger_pos)
+        if row is None:
+            return frame
+        
+        # Draw bright highlight around the visual popup area
+        visual_bounds = self.popup_data[row, 4:8].tolist()
+        cv2.rectangle(frame, 
+                     (visual_bounds[0] - 5, visual_bounds[1] - 5),
+                     (visual_bounds[2] + 5, visual_bounds[3] + 5),
+                     self.colors['hover'], 4)
+        
+        # Add "HOVERING" text
+        cv2.putText(frame, "HOVERING", 
+                   (visual_bounds[0], visual_bounds[1] - 15),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, self.colors['hover'], 2)
         
         return frame
     
@@ -332,26 +444,19 @@ class PopupManager:
             return self.create_placeholder_thumbnail()
         
         try:
+            # Resize to popup size first, so the blend below only touches
+            # popup-sized pixels
+            thumbnail = cv2.resize(clothing_image, self.popup_size)
+            
             # Handle both 3-channel and 4-channel images
-            if len(clothing_image.shape) == 3 and clothing_image.shape[2] == 4:
+            if len(thumbnail.shape) == 3 and thumbnail.shape[2] == 4:
                 # Image has alpha channel
-                bgr = clothing_image[:, :, :3]
-                alpha = clothing_image[:, :, 3]
-                
-                # Create white background
-                white_bg = np.ones_like(bgr) * 255
+                bgr = thumbnail[:, :, :3].astype(np.uint16)
+                alpha = thumbnail[:, :, 3:4].astype(np.uint16)
                 
-                # Blend with white background using alpha
-                alpha_norm = alpha.astype(float) / 255.0
-                alpha_3d = np.stack([alpha_norm] * 3, axis=2)
-                
-                result = bgr.astype(float) * alpha_3d + white_bg.astype(float) * (1 - alpha_3d)
-                result = result.astype(np.uint8)
-            else:
-                result = clothing_image
-            
-            # Resize to popup size
-            thumbnail = cv2.resize(result, self.popup_size)
+                # Blend with white background using alpha, in integer math:
+                # (bgr * a + 255 * (255 - a)) / 255 fits in uint16
+                thumbnail = ((bgr * alpha + 255 * (255 - alpha)) // 255).astype(np.uint8)
             
             # Add subtle border
             cv2.rectangle(thumbnail, (0, 0), (self.popup_size[0]-1, self.popup_size[1]-1), 
@@ -365,7 +470,7 @@ class PopupManager:
     
     def create_placeholder_thumbnail(self):
         """Create placeholder thumbnail when image fails to load"""
-        placeholder = np.ones((self.popup_size[1], self.popup_size[0], 3), dtype=np.uint8) * 240
+        placeholder = np.full((self.popup_size[1], self.popup_size[0], 3), 240, dtype=np.uint8)
         
         # Add "No Image" text
         cv2.putText(placeholder, "No Image", (20, 60), 
@@ -374,8 +479,12 @@ class PopupManager:
         return placeholder
     
     def create_category_icon(self, category):
+        """Category icon for a clothing type (shared - do not draw on it)"""
+        return self._icon_cache.get(category, self._icon_cache['default'])
+    
+    def _draw_category_icon(self, category):
         """Create category icons for clothing types"""
-        icon = np.ones((self.popup_size[1], self.popup_size[0], 3), dtype=np.uint8) * 250
+        icon = np.full((self.popup_size[1], self.popup_size[0], 3), 250, dtype=np.uint8)
         
         center_x, center_y = self.popup_size[0] // 2, self.popup_size[1] // 2
         
@@ -426,18 +535,14 @@ class PopupManager:
     
     def create_styled_popup(self, content, label):
         """Create a beautifully styled popup"""
-        popup_height = self.popup_size[1] + 40
-        popup = np.ones((popup_height, self.popup_size[0], 3), dtype=np.uint8) * 255
-        
-        # Create rounded rectangle background
-        popup_with_border = self.create_rounded_rectangle(
-            popup.shape[1], popup.shape[0], self.corner_radius, self.colors['primary']
-        )
+        # Start from the prebuilt rounded rectangle background
+        popup_with_border = self._rounded_bg.copy()
         
         # Place content in popup
         y_offset = 10
         x_offset = 10
-        content_resized = cv2.resize(content, (self.popup_size[0] - 20, self.popup_size[1] - 40))
+        content_resized = cv2.resize(content, (self.popup_size[0] - 20, self.popup_size[1] - 40),
+                                     dst=self._content_scratch)
         popup_with_border[y_offset:y_offset + content_resized.shape[0], 
                          x_offset:x_offset + content_resized.shape[1]] = content_resized
         
@@ -453,7 +558,7 @@ class PopupManager:
     
     def create_rounded_rectangle(self, width, height, radius, color):
         """Create a rounded rectangle"""
-        img = np.ones((height, width, 3), dtype=np.uint8)
+        img = np.empty((height, width, 3), dtype=np.uint8)
         img[:] = color
         
         # Create mask for rounded corners
@@ -472,24 +577,47 @@ class PopupManager:
         
         return result
     
-    def add_text_to_popup(self, popup, text, position):
-        """Add text to popup with professional styling"""
+    def get_label_sprite(self, text):
+        """Render a popup label once into a (tile, mask, text origin, text width) sprite"""
+        sprite = self._label_cache.get(text)
+        if sprite is not None:
+            return sprite
+        
         font = cv2.FONT_HERSHEY_SIMPLEX
         font_scale = 0.4
         thickness = 1
         
         # Get text size
-        text_size = cv2.getTextSize(text, font, font_scale, thickness)[0]
-        
-        # Center text
-        text_x = position[0] - text_size[0] // 2
-        text_y = position[1]
-        
-        # Add text with shadow effect
-        cv2.putText(popup, text, (text_x + 1, text_y + 1), font, font_scale, 
-                   (200, 200, 200), thickness)
-        cv2.putText(popup, text, (text_x, text_y), font, font_scale, 
-                   self.colors['text'], thickness)
+        (text_w, text_h), baseline = cv2.getTextSize(text, font, font_scale, thickness)
+        pad = thickness + 1  # Room for the 1px shadow offset
+        origin = (pad, text_h + pad)
+        
+        tile = np.zeros((text_h + baseline + 2 * pad, text_w + 2 * pad, 3), dtype=np.uint8)
+        mask = np.zeros(tile.shape[:2], dtype=np.uint8)
+        
+        # Text with shadow effect
+        for offset, color in ((1, (200, 200, 200)), (0, self.colors['text'])):
+            org = (origin[0] + offset, origin[1] + offset)
+            cv2.putText(tile, text, org, font, font_scale, color, thickness)
+            cv2.putText(mask, text, org, font, font_scale, 255, thickness)
+        
+        sprite = (tile, mask, origin, text_w)
+        self._label_cache[text] = sprite
+        return sprite
+    
+    def add_text_to_popup(self, popup, text, position):
+        """Add text to popup with professional styling"""
+        tile, mask, (origin_x, origin_y), text_w = self.get_label_sprite(text)
+        
+        # Center text, then clip the sprite to the popup
+        x = position[0] - text_w // 2 - origin_x
+        y = position[1] - origin_y
+        h, w = mask.shape
+        x1, y1 = max(x, 0), max(y, 0)
+        x2, y2 = min(x + w, popup.shape[1]), min(y + h, popup.shape[0])
+        if x1 < x2 and y1 < y2:
+            cv2.copyTo(tile[y1 - y:y2 - y, x1 - x:x2 - x], mask[y1 - y:y2 - y, x1 - x:x2 - x],
+                       popup[y1:y2, x1:x2])
         
         return popup
     
@@ -501,8 +629,6 @@ class PopupManager:
     
     def create_background_placeholder(self, index):
         """Create placeholder background thumbnail"""
-        placeholder = np.zeros((self.popup_size[1], self.popup_size[0], 3), dtype=np.uint8)
-        
         # Create different gradients for different backgrounds
         colors = [
             [(100, 150, 255), (50, 100, 200)],   # Blue gradient
@@ -517,13 +643,11 @@ class PopupManager:
         
         color_pair = colors[index % len(colors)]
         
-        for i in range(self.popup_size[1]):
-            ratio = i / self.popup_size[1]
-            color = [
-                int(color_pair[0][j] * (1 - ratio) + color_pair[1][j] * ratio)
-                for j in range(3)
-            ]
-            placeholder[i, :] = color
+        # One color per row, then broadcast across the width
+        ratio = (np.arange(self.popup_size[1]) / self.popup_size[1])[:, None]
+        rows = np.array(color_pair[0]) * (1 - ratio) + np.array(color_pair[1]) * ratio
+        placeholder = np.empty((self.popup_size[1], self.popup_size[0], 3), dtype=np.uint8)
+        placeholder[:] = rows.astype(np.uint8)[:, None, :]
         
         # Add background icon
         center = (self.popup_size[0] // 2, self.popup_size[1] // 2)
@@ -0,0 +1,99 @@
+"""
+Sprite-cached UI drawing must match drawing directly on the frame
+"""
+
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+cv2 = pytest.importorskip("cv2")
+
+from ui_components import UIComponents
+
+
+@pytest.fixture
+def ui():
+    return UIComponents()
+
+
+@pytest.fixture
+def frame():
+    return np.random.default_rng(0).integers(0, 256, (720, 1280, 3), dtype=np.uint8)
+
+
+def test_render_sprite_matches_direct_draw(ui, frame):
+    def render(layer, origin=(0, 0)):
+        ox, oy = origin
+        cv2.rectangle(layer, (100 - ox, 100 - oy), (300 - ox, 200 - oy), (0, 0, 0), -1)
+        cv2.circle(layer, (600 - ox, 400 - oy), 40, (40, 167, 69), -1)
+        cv2.putText(layer, "Hello", (700 - ox, 500 - oy), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2)
+        return layer
+
+    expected = render(frame.copy())
+    result = ui.draw_sprite(frame.copy(), ui.render_sprite(frame.shape, (90, 90, 820, 520), render))
+    assert np.array_equal(result, expected)
+
+
+def test_render_sprite_empty(ui, frame):
+    assert ui.render_sprite(frame.shape, (0, 0, 100, 100), lambda layer, origin: layer) is None
+
+
+def draw_detection_progress_baseline(ui, frame, progress):
+    """The progress bar as originally drawn, straight onto the frame"""
+    h, w = frame.shape[:2]
+    bar_x, bar_y = (w - 300) // 2, h - 100
+    cv2.rectangle(frame, (bar_x, bar_y), (bar_x + 300, bar_y + 20), ui.colors['light'], -1)
+    cv2.rectangle(frame, (bar_x, bar_y), (bar_x + int(300 * progress), bar_y + 20), ui.colors['primary'], -1)
+    cv2.rectangle(frame, (bar_x, bar_y), (bar_x + 300, bar_y + 20), ui.colors['dark'], 2)
+    text = f"Detecting face... {int(progress * 100)}%"
+    text_w = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.8, 1)[0][0]
+    cv2.putText(frame, text, (bar_x + (300 - text_w) // 2, bar_y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.8,
+                ui.colors['dark'], 1)
+    return frame
+
+
+def draw_spinner_baseline(ui, frame, center, t):
+    """The loading spinner as originally drawn, from sin/cos of the animation phase"""
+    x, y = center
+    phase = int(t * 3 * ui.phase_steps / (2 * math.pi)) % ui.phase_steps
+    base = phase * (2 * math.pi / ui.phase_steps)
+    for i in range(8):
+        angle = base + i * (2 * math.pi / 8)
+        alpha = (math.sin(angle) + 1) / 2
+        color = tuple(int(c * alpha) for c in ui.colors['primary'])
+        cv2.circle(frame, (int(x + 30 * math.cos(angle)), int(y + 30 * math.sin(angle))), 6, color, -1)
+    return frame
+
+
+NOTIFICATION = ("Screenshot saved successfully!", "success")
+
+CASES = {
+    "step_indicator": (lambda ui, f: ui.draw_step_indicator(f, 2, 5),
+                       lambda ui, f: ui._render_step_indicator(f, 2, 5)),
+    "notification": (lambda ui, f: ui.draw_notification(f, *NOTIFICATION),
+                     lambda ui, f: ui._render_notification(f, *NOTIFICATION)),
+    "hud": (lambda ui, f: ui.draw_hud(f, step=2, total_steps=5, notification=NOTIFICATION),
+            lambda ui, f: ui._render_step_indicator(ui._render_notification(f, *NOTIFICATION), 2, 5)),
+    "progress_start": (lambda ui, f: ui.draw_detection_progress(f, 0.0),
+                       lambda ui, f: draw_detection_progress_baseline(ui, f, 0.0)),
+    "progress_mid": (lambda ui, f: ui.draw_detection_progress(f, 0.333),
+                     lambda ui, f: draw_detection_progress_baseline(ui, f, 0.333)),
+    "progress_done": (lambda ui, f: ui.draw_detection_progress(f, 1.0),
+                      lambda ui, f: draw_detection_progress_baseline(ui, f, 1.0)),
+}
+
+
+@pytest.mark.parametrize("case", sorted(CASES))
+def test_cached_drawing_matches_baseline(ui, frame, case):
+    draw, baseline = CASES[case]
+    draw(ui, frame.copy())  # Fill the caches
+    assert np.array_equal(draw(ui, frame.copy()), baseline(ui, frame.copy()))
+
+
+@pytest.mark.parametrize("t", [0.0, 0.37, 1.9])
+def test_spinner_matches_baseline(ui, frame, monkeypatch, t):
+    monkeypatch.setattr("ui_components.time.time", lambda: t)
+    ui.draw_loading_animation(frame.copy(), (640, 460))  # Fill the cache
+    expected = draw_spinner_baseline(ui, frame.copy(), (640, 460), t)
+    assert np.array_equal(ui.draw_loading_animation(frame.copy(), (640, 460)), expected)
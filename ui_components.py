@@ -6,6 +6,13 @@ import cv2
 import numpy as np
 import time
 import math
+from collections import OrderedDict
+from functools import lru_cache
+
+@lru_cache(maxsize=512)
+def _text_size(text, font, scale, thickness):
+    """cv2.getTextSize(...)[0], memoized - UI strings repeat every frame"""
+    return cv2.getTextSize(text, font, scale, thickness)[0]
 
 class UIComponents:
     def __init__(self):
@@ -43,56 +50,161 @@ class UIComponents:
         self.animation_speed = 0.1
         self.pulse_amplitude = 0.3
         
+        # Face outline corner brackets as (4 corners, 3 points) templates:
+        # point = (x, y) + corner * (w, h) + arm * corner_length
+        self._corner_length = 30
+        self._bracket_corners = np.array([
+            [[0, 0], [0, 0], [0, 0]],  # Top-left
+            [[1, 0], [1, 0], [1, 0]],  # Top-right
+            [[0, 1], [0, 1], [0, 1]],  # Bottom-left
+            [[1, 1], [1, 1], [1, 1]],  # Bottom-right
+        ], dtype=np.int32)
+        self._bracket_arms = np.array([
+            [[0, 1], [0, 0], [1, 0]],
+            [[-1, 0], [0, 0], [0, 1]],
+            [[0, -1], [0, 0], [1, 0]],
+            [[-1, 0], [0, 0], [0, -1]],
+        ], dtype=np.int32) * self._corner_length
+        
+        # Animation phase lookup tables (256 steps per turn): spinner dots as
+        # (dx, dy, color) per phase, cursor outer ring radius per phase
+        self.phase_steps = 256
+        phases = np.arange(self.phase_steps) * (2 * math.pi / self.phase_steps)
+        angles = phases[:, None] + np.arange(8) * (2 * math.pi / 8)
+        spin_dx = np.floor(30 * np.cos(angles)).astype(int)
+        spin_dy = np.floor(30 * np.sin(angles)).astype(int)
+        spin_alpha = (np.sin(angles) + 1) / 2
+        # Faded primary colors for every dot at once, truncated like int()
+        spin_colors = (spin_alpha[:, :, None] * np.array(self.colors['primary'], dtype=np.float64)).astype(int)
+        self._spinner_lut = [
+            [(dx, dy, tuple(color)) for dx, dy, color in zip(row_dx, row_dy, row_colors)]
+            for row_dx, row_dy, row_colors in zip(spin_dx.tolist(), spin_dy.tolist(), spin_colors.tolist())
+        ]
+        self._spinner_canvas = 2 * (30 + 6) + 3  # Dot ring radius plus dot radius, with a margin
+        self._spinner_frames = [None] * self.phase_steps  # Rendered lazily, see draw_loading_animation
+        self._pulse_radius_lut = [int(20 * (math.sin(p) * self.pulse_amplitude + 1)) for p in phases]
+        
+        self._welcome_title_sprite = None  # Glow + title, see get_welcome_title_sprite
+        
+        # Fixed color blends as per-channel cv2.LUT tables, see blend_lut:
+        # completion banner (0.2 success green), welcome screen (0.7 dark)
+        self._complete_lut = self.blend_lut(self.colors['success'], 0.2)
+        self._dark_lut = self.blend_lut(self.colors['dark'], 0.7)
+        
+        # Welcome title glow colors for shadow offsets 3, 2, 1 (alpha 0.3 / offset)
+        self._title_glow = tuple(
+            (offset, tuple(int(c * (0.3 / offset)) for c in self.colors['primary']))
+            for offset in range(3, 0, -1)
+        )
+        
+        # Pre-rendered text sprites (LRU), see draw_cached_text
+        self.text_sprites = OrderedDict()
+        self.max_text_sprites = 512
+        
+        # Pre-rendered ring sprites keyed by (radius, color, thickness), see draw_cached_ring
+        self.ring_sprites = {}
+        
+        # Finished gradients keyed by (height, width, gradient type), LRU,
+        # see create_gradient_background
+        self.gradient_cache = OrderedDict()
+        self.max_gradients = 16
+        
+        # Solid color tiles keyed by (height, width, color), see blend_rect
+        self.solid_tiles = {}
+        
+        # FPS label sprites by FPS rounded to 0.5, see draw_fps_counter
+        self._fps_sprites = {}
+        
+        # Step indicator sprites by (frame shape, current step, total steps)
+        self._step_sprites = {}
+        
+        # Detection progress bar border sprites by frame shape
+        self._progress_borders = {}
+        
+        # Notification sprites by (frame shape, message, type)
+        self._notification_sprites = {}
+        
+        # Composited HUD (tile, mask, top-left) and the state it shows, see draw_hud
+        self._hud_key = None
+        self._hud_layer = None
+        
+        # Rendered buttons by (width, height, text, color scheme), read-only,
+        # see create_modern_button
+        self._button_cache = {}
+        
+        # Scratch tile the finger cursor is drawn on before being copied back
+        self._cursor_scratch = np.empty((120, 120, 3), dtype=np.uint8)
+        
         print("🎨 UI components initialized with professional styling!")
     
     def draw_welcome_screen(self, frame):
         """Draw animated welcome screen"""
-        overlay = frame.copy()
         h, w = frame.shape[:2]
         
-        # Semi-transparent overlay
-        cv2.rectangle(overlay, (0, 0), (w, h), self.colors['dark'], -1)
-        frame = cv2.addWeighted(frame, 0.3, overlay, 0.7, 0)
+        # Semi-transparent overlay, one in-place table lookup
+        cv2.LUT(frame, self._dark_lut, dst=frame)
         
         # Title
         title = "AI Professional Makeover"
-        title_size = cv2.getTextSize(title, self.fonts['title'], self.font_scales['title'], 3)[0]
+        title_size = _text_size(title, self.fonts['title'], self.font_scales['title'], 3)
         title_x = (w - title_size[0]) // 2
         title_y = h // 2 - 100
         
-        # Animated title with glow effect
-        for offset in range(3, 0, -1):
-            alpha = 0.3 / offset
-            glow_color = tuple(int(c * alpha) for c in self.colors['primary'])
-            cv2.putText(frame, title, (title_x + offset, title_y + offset), 
-                       self.fonts['title'], self.font_scales['title'], glow_color, 5)
-        
-        cv2.putText(frame, title, (title_x, title_y), 
-                   self.fonts['title'], self.font_scales['title'], self.colors['white'], 3)
+        # Animated title with glow effect (all passes pre-rendered in one sprite)
+        tile, mask, (origin_x, origin_y) = self.get_welcome_title_sprite(title)
+        frame = self.blit_sprite(frame, tile, mask, (title_x - origin_x, title_y - origin_y))
         
         # Subtitle
         subtitle = "Transform your video calls instantly"
-        subtitle_size = cv2.getTextSize(subtitle, self.fonts['subtitle'], self.font_scales['subtitle'], 2)[0]
+        subtitle_size = _text_size(subtitle, self.fonts['subtitle'], self.font_scales['subtitle'], 2)
         subtitle_x = (w - subtitle_size[0]) // 2
         subtitle_y = title_y + 80
         
-        cv2.putText(frame, subtitle, (subtitle_x, subtitle_y), 
-                   self.fonts['subtitle'], self.font_scales['subtitle'], self.colors['light'], 2)
+        frame = self.draw_cached_text(frame, subtitle, (subtitle_x, subtitle_y),
+                                      self.fonts['subtitle'], self.font_scales['subtitle'], self.colors['light'], 2)
         
         # Animated loading indicator
         self.draw_loading_animation(frame, (w // 2, subtitle_y + 60))
         
         # Instructions
         instruction = "Initializing camera... Please wait"
-        inst_size = cv2.getTextSize(instruction, self.fonts['body'], self.font_scales['body'], 1)[0]
+        inst_size = _text_size(instruction, self.fonts['body'], self.font_scales['body'], 1)
         inst_x = (w - inst_size[0]) // 2
         inst_y = subtitle_y + 120
         
-        cv2.putText(frame, instruction, (inst_x, inst_y), 
-                   self.fonts['body'], self.font_scales['body'], self.colors['secondary'], 1)
+        frame = self.draw_cached_text(frame, instruction, (inst_x, inst_y),
+                                      self.fonts['body'], self.font_scales['body'], self.colors['secondary'], 1)
         
         return frame
     
+    def get_welcome_title_sprite(self, title):
+        """Render the welcome title and its three glow passes into one (tile, mask, origin) sprite
+        
+        The passes are drawn in the same order as on the frame, so later
+        passes overwrite earlier ones exactly as before
+        """
+        if self._welcome_title_sprite is not None:
+            return self._welcome_title_sprite
+        
+        font, scale = self.fonts['title'], self.font_scales['title']
+        (text_w, text_h), baseline = cv2.getTextSize(title, font, scale, 5)
+        pad = 5
+        max_offset = self._title_glow[0][0]
+        origin = (pad, text_h + pad)
+        
+        shape = (text_h + baseline + 2 * pad + max_offset, text_w + 2 * pad + max_offset)
+        tile = np.zeros(shape + (3,), dtype=np.uint8)
+        mask = np.zeros(shape, dtype=np.uint8)
+        passes = [(offset, glow_color, 5) for offset, glow_color in self._title_glow]
+        passes.append((0, self.colors['white'], 3))
+        for offset, color, thickness in passes:
+            org = (origin[0] + offset, origin[1] + offset)
+            cv2.putText(tile, title, org, font, scale, color, thickness)
+            cv2.putText(mask, title, org, font, scale, 255, thickness)
+        
+        self._welcome_title_sprite = (tile, mask, origin)
+        return self._welcome_title_sprite
+    
     def draw_face_outline(self, frame, face_box):
         """Draw professional face detection outline"""
         if face_box is None:
@@ -103,27 +215,16 @@ class UIComponents:
         # Draw rounded rectangle outline
         color = self.colors['success']
         thickness = 3
-        corner_length = 30
-        
-        # Top-left corner
-        cv2.line(frame, (x, y + corner_length), (x, y), color, thickness)
-        cv2.line(frame, (x, y), (x + corner_length, y), color, thickness)
-        
-        # Top-right corner
-        cv2.line(frame, (x + w - corner_length, y), (x + w, y), color, thickness)
-        cv2.line(frame, (x + w, y), (x + w, y + corner_length), color, thickness)
         
-        # Bottom-left corner
-        cv2.line(frame, (x, y + h - corner_length), (x, y + h), color, thickness)
-        cv2.line(frame, (x, y + h), (x + corner_length, y + h), color, thickness)
-        
-        # Bottom-right corner
-        cv2.line(frame, (x + w - corner_length, y + h), (x + w, y + h), color, thickness)
-        cv2.line(frame, (x + w, y + h), (x + w, y + h - corner_length), color, thickness)
+        # All four L-shaped corners in one call
+        corners = self._bracket_corners * np.array((w, h), dtype=np.int32)
+        corners += self._bracket_arms
+        corners += np.array((x, y), dtype=np.int32)
+        cv2.polylines(frame, corners, False, color, thickness)
         
         # Add face detected indicator
         indicator_text = "Face Detected ✓"
-        text_size = cv2.getTextSize(indicator_text, self.fonts['body'], self.font_scales['body'], 2)[0]
+        text_size = _text_size(indicator_text, self.fonts['body'], self.font_scales['body'], 2)
         text_x = x + w // 2 - text_size[0] // 2
         text_y = y - 20
         
@@ -137,7 +238,11 @@ class UIComponents:
         return frame
     
     def draw_detection_progress(self, frame, progress):
-        """Draw face detection progress bar"""
+        """Draw face detection progress bar
+        
+        The background and fill are plain slice fills; the border (one sprite
+        per frame size) and the label (text sprites) are cached
+        """
         h, w = frame.shape[:2]
         
         # Progress bar dimensions
@@ -146,37 +251,40 @@ class UIComponents:
         bar_x = (w - bar_width) // 2
         bar_y = h - 100
         
-        # Background
-        cv2.rectangle(frame, (bar_x, bar_y), (bar_x + bar_width, bar_y + bar_height), 
-                     self.colors['light'], -1)
+        # Background (cv2.rectangle corners are inclusive)
+        rows = slice(max(bar_y, 0), max(bar_y + bar_height + 1, 0))
+        frame[rows, max(bar_x, 0):max(bar_x + bar_width + 1, 0)] = self.colors['light']
         
         # Progress fill
         fill_width = int(bar_width * progress)
-        cv2.rectangle(frame, (bar_x, bar_y), (bar_x + fill_width, bar_y + bar_height), 
-                     self.colors['primary'], -1)
+        frame[rows, max(bar_x, 0):max(bar_x + fill_width + 1, 0)] = self.colors['primary']
         
         # Border
-        cv2.rectangle(frame, (bar_x, bar_y), (bar_x + bar_width, bar_y + bar_height), 
-                     self.colors['dark'], 2)
+        border = self._progress_borders.get(frame.shape)
+        if border is None:
+            def render(layer, origin):
+                x, y = bar_x - origin[0], bar_y - origin[1]
+                cv2.rectangle(layer, (x, y), (x + bar_width, y + bar_height), self.colors['dark'], 2)
+                return layer
+            
+            border = self.render_sprite(frame.shape, (bar_x - 3, bar_y - 3, bar_x + bar_width + 4, bar_y + bar_height + 4),
+                                        render)
+            self._progress_borders[frame.shape] = border
+        frame = self.draw_sprite(frame, border)
         
         # Progress text
         progress_text = f"Detecting face... {int(progress * 100)}%"
-        text_size = cv2.getTextSize(progress_text, self.fonts['body'], self.font_scales['body'], 1)[0]
+        text_size = _text_size(progress_text, self.fonts['body'], self.font_scales['body'], 1)
         text_x = bar_x + (bar_width - text_size[0]) // 2
         text_y = bar_y - 10
         
-        cv2.putText(frame, progress_text, (text_x, text_y), 
-                   self.fonts['body'], self.font_scales['body'], self.colors['dark'], 1)
-        
-        return frame
+        return self.draw_cached_text(frame, progress_text, (text_x, text_y),
+                                     self.fonts['body'], self.font_scales['body'], self.colors['dark'], 1)
     
     def draw_face_detection_guide(self, frame):
         """Draw face detection guidance"""
         h, w = frame.shape[:2]
         
-        # Guide overlay
-        overlay = frame.copy()
-        
         # Draw face outline guide in center
         guide_size = 200
         guide_x = (w - guide_size) // 2
@@ -187,27 +295,25 @@ class UIComponents:
         gap_length = 10
         color = self.colors['warning']
         
-        # Top line
-        for x in range(guide_x, guide_x + guide_size, dash_length + gap_length):
-            cv2.line(frame, (x, guide_y), (min(x + dash_length, guide_x + guide_size), guide_y), color, 3)
-        
-        # Bottom line
-        for x in range(guide_x, guide_x + guide_size, dash_length + gap_length):
-            cv2.line(frame, (x, guide_y + guide_size), 
-                    (min(x + dash_length, guide_x + guide_size), guide_y + guide_size), color, 3)
-        
-        # Left line
-        for y in range(guide_y, guide_y + guide_size, dash_length + gap_length):
-            cv2.line(frame, (guide_x, y), (guide_x, min(y + dash_length, guide_y + guide_size)), color, 3)
-        
-        # Right line
-        for y in range(guide_y, guide_y + guide_size, dash_length + gap_length):
-            cv2.line(frame, (guide_x + guide_size, y), 
-                    (guide_x + guide_size, min(y + dash_length, guide_y + guide_size)), color, 3)
+        # Dash start/end offsets along one side
+        starts = np.arange(0, guide_size, dash_length + gap_length, dtype=np.int32)
+        ends = np.minimum(starts + dash_length, guide_size)
+        
+        # (N, 2, 2) dash segments for all four sides, drawn in one call
+        segs = np.empty((4, len(starts), 2, 2), dtype=np.int32)
+        segs[0:2, :, 0, 0] = guide_x + starts  # Top and bottom lines
+        segs[0:2, :, 1, 0] = guide_x + ends
+        segs[0, :, :, 1] = guide_y
+        segs[1, :, :, 1] = guide_y + guide_size
+        segs[2:4, :, 0, 1] = guide_y + starts  # Left and right lines
+        segs[2:4, :, 1, 1] = guide_y + ends
+        segs[2, :, :, 0] = guide_x
+        segs[3, :, :, 0] = guide_x + guide_size
+        cv2.polylines(frame, segs.reshape(-1, 2, 2), False, color, 3)
         
         # Instructions
         instruction = "Please position your face in the frame"
-        inst_size = cv2.getTextSize(instruction, self.fonts['subtitle'], self.font_scales['subtitle'], 2)[0]
+        inst_size = _text_size(instruction, self.fonts['subtitle'], self.font_scales['subtitle'], 2)
         inst_x = (w - inst_size[0]) // 2
         inst_y = guide_y - 40
         
@@ -221,25 +327,38 @@ class UIComponents:
         if finger_pos is None:
             return frame
         
-        x, y = finger_pos
+        # Draw on a small tile around the cursor (clamped to the frame)
+        # and copy it back once, instead of drawing on the full frame
+        tile_h, tile_w = self._cursor_scratch.shape[:2]
+        fh, fw = frame.shape[:2]
+        x1, y1 = max(finger_pos[0] - tile_w // 2, 0), max(finger_pos[1] - tile_h // 2, 0)
+        x2, y2 = min(finger_pos[0] + tile_w // 2, fw), min(finger_pos[1] + tile_h // 2, fh)
+        if x1 >= x2 or y1 >= y2:
+            return frame
+        
+        roi = frame[y1:y2, x1:x2]
+        tile = self._cursor_scratch[:y2 - y1, :x2 - x1]
+        np.copyto(tile, roi)
+        x, y = finger_pos[0] - x1, finger_pos[1] - y1
         
         # Animated cursor with pulse effect
-        time_val = time.time()
-        pulse = math.sin(time_val * 5) * self.pulse_amplitude + 1
+        phase = int(time.time() * 5 * self.phase_steps / (2 * math.pi)) % self.phase_steps
         
         # Outer ring
-        outer_radius = int(20 * pulse)
-        cv2.circle(frame, (x, y), outer_radius, self.colors['primary'], 3)
+        outer_radius = self._pulse_radius_lut[phase]
+        cv2.circle(tile, (x, y), outer_radius, self.colors['primary'], 3)
         
         # Inner circle
         inner_radius = 8
-        cv2.circle(frame, (x, y), inner_radius, self.colors['white'], -1)
-        cv2.circle(frame, (x, y), inner_radius, self.colors['primary'], 2)
+        cv2.circle(tile, (x, y), inner_radius, self.colors['white'], -1)
+        cv2.circle(tile, (x, y), inner_radius, self.colors['primary'], 2)
         
         # Crosshair
         cross_length = 15
-        cv2.line(frame, (x - cross_length, y), (x + cross_length, y), self.colors['primary'], 2)
-        cv2.line(frame, (x, y - cross_length), (x, y + cross_length), self.colors['primary'], 2)
+        cv2.line(tile, (x - cross_length, y), (x + cross_length, y), self.colors['primary'], 2)
+        cv2.line(tile, (x, y - cross_length), (x, y + cross_length), self.colors['primary'], 2)
+        
+        np.copyto(roi, tile)
         
         return frame
     
@@ -248,7 +367,7 @@ class UIComponents:
         x, y = position
         
         # Get text size
-        text_size = cv2.getTextSize(text, self.fonts['subtitle'], self.font_scales['subtitle'], 2)[0]
+        text_size = _text_size(text, self.fonts['subtitle'], self.font_scales['subtitle'], 2)
         
         # Center text
         text_x = x - text_size[0] // 2
@@ -262,13 +381,11 @@ class UIComponents:
         bg_y2 = text_y + padding
         
         # Draw background with rounded corners
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (bg_x1, bg_y1), (bg_x2, bg_y2), self.colors['dark'], -1)
-        frame = cv2.addWeighted(frame, 0.7, overlay, 0.3, 0)
+        frame = self.blend_rect(frame, (bg_x1, bg_y1), (bg_x2, bg_y2), self.colors['dark'], 0.3)
         
-        # Draw text
-        cv2.putText(frame, text, (text_x, text_y), 
-                   self.fonts['subtitle'], self.font_scales['subtitle'], self.colors['white'], 2)
+        # Draw text (glyphs are rasterized once per instruction string)
+        frame = self.draw_cached_text(frame, text, (text_x, text_y),
+                                      self.fonts['subtitle'], self.font_scales['subtitle'], self.colors['white'], 2)
         
         return frame
     
@@ -276,14 +393,13 @@ class UIComponents:
         """Draw completion screen with options"""
         h, w = frame.shape[:2]
         
-        # Semi-transparent overlay at top
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (0, 0), (w, 150), self.colors['success'], -1)
-        frame = cv2.addWeighted(frame, 0.8, overlay, 0.2, 0)
+        # Semi-transparent overlay at top (rows 0-150), one in-place table lookup
+        banner = frame[:151]
+        cv2.LUT(banner, self._complete_lut, dst=banner)
         
         # Completion message
         title = "✨ Professional Look Complete! ✨"
-        title_size = cv2.getTextSize(title, self.fonts['title'], 1.2, 3)[0]
+        title_size = _text_size(title, self.fonts['title'], 1.2, 3)
         title_x = (w - title_size[0]) // 2
         title_y = 60
         
@@ -292,7 +408,7 @@ class UIComponents:
         
         # Instructions
         instruction = "Point and click anywhere to save screenshot • Press 'R' to restart • Press 'Q' to quit"
-        inst_size = cv2.getTextSize(instruction, self.fonts['body'], self.font_scales['body'], 1)[0]
+        inst_size = _text_size(instruction, self.fonts['body'], self.font_scales['body'], 1)
         inst_x = (w - inst_size[0]) // 2
         inst_y = 100
         
@@ -316,7 +432,7 @@ class UIComponents:
         
         # Button text
         text = "📸 Save Photo"
-        text_size = cv2.getTextSize(text, self.fonts['body'], self.font_scales['body'], 1)[0]
+        text_size = _text_size(text, self.fonts['body'], self.font_scales['body'], 1)
         text_x = x + (button_width - text_size[0]) // 2
         text_y = y + (button_height + text_size[1]) // 2
         
@@ -328,27 +444,37 @@ class UIComponents:
     def draw_loading_animation(self, frame, center):
         """Draw animated loading spinner"""
         x, y = center
-        radius = 30
-        time_val = time.time()
-        
-        # Rotating dots
-        num_dots = 8
-        for i in range(num_dots):
-            angle = (time_val * 3 + i * 2 * math.pi / num_dots) % (2 * math.pi)
-            dot_x = int(x + radius * math.cos(angle))
-            dot_y = int(y + radius * math.sin(angle))
+        phase = int(time.time() * 3 * self.phase_steps / (2 * math.pi)) % self.phase_steps
+        
+        # Each phase's dots are rendered once, around the middle of a small canvas
+        sprite = self._spinner_frames[phase]
+        if sprite is None:
+            c = self._spinner_canvas // 2
             
-            # Fade effect
-            alpha = (math.sin(time_val * 3 + i * 2 * math.pi / num_dots) + 1) / 2
-            color = tuple(int(c * alpha) for c in self.colors['primary'])
+            def render(layer, origin):
+                # Rotating dots (radius 30) with fade effect, from the phase table
+                for dx, dy, color in self._spinner_lut[phase]:
+                    cv2.circle(layer, (c + dx, c + dy), 6, color, -1)
+                return layer
             
-            cv2.circle(frame, (dot_x, dot_y), 6, color, -1)
+            size = self._spinner_canvas
+            tile, mask, (sx, sy) = self.render_sprite((size, size, 3), (0, 0, size, size), render)
+            sprite = (tile, mask, (sx - c, sy - c))
+            self._spinner_frames[phase] = sprite
         
-        return frame
+        tile, mask, (dx, dy) = sprite
+        return self.blit_sprite(frame, tile, mask, (x + dx, y + dy))
     
     def create_gradient_background(self, width, height, gradient_type=0):
-        """Create gradient background for placeholders"""
-        background = np.zeros((height, width, 3), dtype=np.uint8)
+        """Create gradient background for placeholders
+        
+        Returns a fresh copy the caller may draw on
+        """
+        key = (height, width, gradient_type)
+        background = self.gradient_cache.get(key)
+        if background is not None:
+            self.gradient_cache.move_to_end(key)
+            return background.copy()
         
         gradients = [
             # Professional gradients
@@ -364,26 +490,55 @@ class UIComponents:
         
         start_color, end_color = gradients[gradient_type % len(gradients)]
         
-        for y in range(height):
-            ratio = y / height
-            color = [
-                int(start_color[i] * (1 - ratio) + end_color[i] * ratio)
-                for i in range(3)
-            ]
-            background[y, :] = color
+        # One color per row, then broadcast across the width
+        ratio = (np.arange(height) / height)[:, None]
+        rows = np.array(start_color) * (1 - ratio) + np.array(end_color) * ratio
+        background = np.empty((height, width, 3), dtype=np.uint8)
+        background[:] = rows.astype(np.uint8)[:, None, :]
         
-        return background
+        self.gradient_cache[key] = background
+        if len(self.gradient_cache) > self.max_gradients:
+            self.gradient_cache.popitem(last=False)
+        
+        return background.copy()
     
     def draw_step_indicator(self, frame, current_step, total_steps):
-        """Draw step progress indicator"""
-        h, w = frame.shape[:2]
-        
+        """Draw step progress indicator (one cached sprite per step and frame size)"""
+        return self.draw_sprite(frame, self.get_step_indicator_sprite(frame.shape, current_step, total_steps))
+    
+    def get_step_indicator_sprite(self, shape, current_step, total_steps):
+        """Step indicator as a (tile, mask, top-left) sprite, rendered once per step and frame size"""
+        key = (shape, current_step, total_steps)
+        sprite = self._step_sprites.get(key)
+        if sprite is None:
+            w = shape[1]
+            start_x, indicator_y, step_spacing = self._step_indicator_layout(w, total_steps)
+            bbox = (start_x - 20, indicator_y - 30, start_x + (total_steps - 1) * step_spacing + 20, indicator_y + 30)
+            sprite = self.render_sprite(
+                shape, bbox,
+                lambda layer, origin: self._render_step_indicator(layer, current_step, total_steps, w, origin)
+            )
+            self._step_sprites[key] = sprite
+        return sprite
+    
+    def _step_indicator_layout(self, w, total_steps):
+        """(first step x, indicator y, step spacing) for a frame w pixels wide"""
         # Position at top of screen
         indicator_y = 30
-        step_width = 40
         step_spacing = 60
         total_width = total_steps * step_spacing
-        start_x = (w - total_width) // 2
+        return (w - total_width) // 2, indicator_y, step_spacing
+    
+    def _render_step_indicator(self, frame, current_step, total_steps, frame_w=None, origin=(0, 0)):
+        """Draw step progress indicator
+        
+        frame may be a canvas whose top-left is at origin in a frame
+        frame_w pixels wide (defaults: the frame itself)
+        """
+        w = frame.shape[1] if frame_w is None else frame_w
+        start_x, indicator_y, step_spacing = self._step_indicator_layout(w, total_steps)
+        start_x -= origin[0]
+        indicator_y -= origin[1]
         
         for i in range(total_steps):
             step_x = start_x + i * step_spacing
@@ -412,8 +567,46 @@ class UIComponents:
         return frame
     
     def draw_notification(self, frame, message, notification_type="info"):
-        """Draw notification popup"""
-        h, w = frame.shape[:2]
+        """Draw notification popup (one cached sprite per message, type and frame size)"""
+        return self.draw_sprite(frame, self.get_notification_sprite(frame.shape, message, notification_type))
+    
+    def get_notification_sprite(self, shape, message, notification_type="info"):
+        """Notification as a (tile, mask, top-left) sprite, rendered once per message, type and frame size"""
+        key = (shape, message, notification_type)
+        sprite = self._notification_sprites.get(key)
+        if sprite is None:
+            w = shape[1]
+            notif_x, notif_y, notif_width, notif_height, text_x, text_y = self._notification_layout(w, message)
+            text_w = _text_size(message, self.fonts['body'], self.font_scales['body'], 1)[0]
+            bbox = (min(notif_x, text_x) - 5, notif_y - 5,
+                    max(notif_x + notif_width, text_x + text_w) + 10, notif_y + notif_height + 10)
+            sprite = self.render_sprite(
+                shape, bbox,
+                lambda layer, origin: self._render_notification(layer, message, notification_type, w, origin)
+            )
+            self._notification_sprites[key] = sprite
+        return sprite
+    
+    def _notification_layout(self, w, message):
+        """(x, y, width, height, text x, text y) of a notification in a frame w pixels wide"""
+        # Notification dimensions, sized to the measured text
+        text_size = _text_size(message, self.fonts['body'], self.font_scales['body'], 1)
+        notif_height = 60
+        notif_width = min(text_size[0] + 40, w - 40)
+        notif_x = (w - notif_width) // 2
+        notif_y = 20
+        
+        text_x = notif_x + (notif_width - text_size[0]) // 2
+        text_y = notif_y + (notif_height + text_size[1]) // 2
+        return notif_x, notif_y, notif_width, notif_height, text_x, text_y
+    
+    def _render_notification(self, frame, message, notification_type, frame_w=None, origin=(0, 0)):
+        """Draw notification popup
+        
+        frame may be a canvas whose top-left is at origin in a frame
+        frame_w pixels wide (defaults: the frame itself)
+        """
+        w = frame.shape[1] if frame_w is None else frame_w
         
         # Notification colors
         type_colors = {
@@ -425,11 +618,11 @@ class UIComponents:
         
         color = type_colors.get(notification_type, self.colors['primary'])
         
-        # Notification dimensions
-        notif_height = 60
-        notif_width = min(len(message) * 12 + 40, w - 40)
-        notif_x = (w - notif_width) // 2
-        notif_y = 20
+        notif_x, notif_y, notif_width, notif_height, text_x, text_y = self._notification_layout(w, message)
+        notif_x -= origin[0]
+        notif_y -= origin[1]
+        text_x -= origin[0]
+        text_y -= origin[1]
         
         # Background with shadow
         shadow_offset = 3
@@ -444,10 +637,6 @@ class UIComponents:
                      self.colors['white'], 2)
         
         # Message text
-        text_size = cv2.getTextSize(message, self.fonts['body'], self.font_scales['body'], 1)[0]
-        text_x = notif_x + (notif_width - text_size[0]) // 2
-        text_y = notif_y + (notif_height + text_size[1]) // 2
-        
         cv2.putText(frame, message, (text_x, text_y), 
                    self.fonts['body'], self.font_scales['body'], self.colors['white'], 1)
         
@@ -463,18 +652,15 @@ class UIComponents:
         thickness = 1
         
         # Position at bottom right
-        text_size = cv2.getTextSize(watermark, self.fonts['caption'], font_scale, thickness)[0]
+        text_size = _text_size(watermark, self.fonts['caption'], font_scale, thickness)
         text_x = w - text_size[0] - 20
         text_y = h - 20
         
         # Semi-transparent background
         bg_padding = 5
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (text_x - bg_padding, text_y - text_size[1] - bg_padding), 
-                     (text_x + text_size[0] + bg_padding, text_y + bg_padding), 
-                     self.colors['dark'], -1)
-        
-        frame = cv2.addWeighted(frame, 0.9, overlay, 0.1, 0)
+        frame = self.blend_rect(frame, (text_x - bg_padding, text_y - text_size[1] - bg_padding),
+                                (text_x + text_size[0] + bg_padding, text_y + bg_padding),
+                                self.colors['dark'], 0.1)
         
         # Watermark text
         cv2.putText(frame, watermark, (text_x, text_y), 
@@ -484,15 +670,55 @@ class UIComponents:
     
     def draw_fps_counter(self, frame, fps):
         """Draw FPS counter for performance monitoring"""
-        fps_text = f"FPS: {fps:.1f}"
-        cv2.putText(frame, fps_text, (10, 30), 
-                   self.fonts['caption'], self.font_scales['caption'], self.colors['success'], 1)
+        return self.draw_sprite(frame, self.get_fps_sprite(fps))
+    
+    def get_fps_sprite(self, fps):
+        """FPS label as a (tile, mask, top-left) sprite, one per half-FPS step"""
+        bucket = round(fps * 2) / 2
+        sprite = self._fps_sprites.get(bucket)
+        if sprite is None:
+            tile, mask, (origin_x, origin_y) = self.get_text_sprite(
+                f"FPS: {bucket:.1f}", self.fonts['caption'], self.font_scales['caption'], self.colors['success'], 1
+            )
+            sprite = (tile, mask, (10 - origin_x, 30 - origin_y))
+            self._fps_sprites[bucket] = sprite
+        return sprite
+    
+    def draw_hud(self, frame, fps=None, step=None, total_steps=None, notification=None):
+        """Draw the FPS counter, step indicator and notification in one masked copy
+        
+        notification is a (message, notification_type) pair. The elements are
+        opaque, so their cached sprites are merged into one layer, which is
+        only rebuilt when what they show changes
+        """
+        fps_bucket = None if fps is None else round(fps * 2) / 2
+        key = (frame.shape, fps_bucket, step, total_steps, notification)
+        if key != self._hud_key:
+            sprites = []
+            if notification is not None:
+                sprites.append(self.get_notification_sprite(frame.shape, *notification))
+            if step is not None:
+                sprites.append(self.get_step_indicator_sprite(frame.shape, step, total_steps))
+            if fps_bucket is not None:
+                sprites.append(self.get_fps_sprite(fps_bucket))
+            
+            self._hud_layer = self.merge_sprites([sprite for sprite in sprites if sprite is not None])
+            self._hud_key = key
         
-        return frame
+        return self.draw_sprite(frame, self._hud_layer)
     
     def create_modern_button(self, width, height, text, color_scheme='primary'):
-        """Create modern button graphics"""
-        button = np.ones((height, width, 3), dtype=np.uint8) * 255
+        """Create modern button graphics
+        
+        Buttons are rendered once per (width, height, text, color_scheme) and
+        shared read-only - copy before drawing on one
+        """
+        key = (width, height, text, color_scheme)
+        button = self._button_cache.get(key)
+        if button is not None:
+            return button
+        
+        button = np.full((height, width, 3), 255, dtype=np.uint8)
         
         # Button color
         bg_color = self.colors.get(color_scheme, self.colors['primary'])
@@ -501,11 +727,167 @@ class UIComponents:
         cv2.rectangle(button, (5, 5), (width - 5, height - 5), bg_color, -1)
         
         # Text
-        text_size = cv2.getTextSize(text, self.fonts['body'], self.font_scales['body'], 2)[0]
+        text_size = _text_size(text, self.fonts['body'], self.font_scales['body'], 2)
         text_x = (width - text_size[0]) // 2
         text_y = (height + text_size[1]) // 2
         
         cv2.putText(button, text, (text_x, text_y), 
                    self.fonts['body'], self.font_scales['body'], self.colors['white'], 2)
         
-        return button
\ No newline at end of file
+        button.flags.writeable = False
+        self._button_cache[key] = button
+        return button
+    
+    def get_text_sprite(self, text, font, scale, color, thickness):
+        """Render text once into a (color tile, mask, baseline offset) sprite"""
+        key = (text, font, scale, color, thickness)
+        sprite = self.text_sprites.get(key)
+        if sprite is not None:
+            self.text_sprites.move_to_end(key)
+            return sprite
+        
+        (text_w, text_h), baseline = cv2.getTextSize(text, font, scale, thickness)
+        pad = thickness
+        
+        # Glyph mask, with the text origin at (pad, text_h + pad)
+        mask = np.zeros((text_h + baseline + 2 * pad, text_w + 2 * pad), dtype=np.uint8)
+        cv2.putText(mask, text, (pad, text_h + pad), font, scale, 255, thickness)
+        
+        tile = np.empty(mask.shape + (3,), dtype=np.uint8)
+        tile[:] = color
+        
+        sprite = (tile, mask, (pad, text_h + pad))
+        self.text_sprites[key] = sprite
+        if len(self.text_sprites) > self.max_text_sprites:
+            self.text_sprites.popitem(last=False)
+        
+        return sprite
+    
+    def blit_sprite(self, frame, tile, mask, top_left):
+        """Copy tile into frame where mask is set, clipped to the frame"""
+        x, y = top_left
+        h, w = mask.shape[:2]
+        fh, fw = frame.shape[:2]
+        
+        x1, y1 = max(x, 0), max(y, 0)
+        x2, y2 = min(x + w, fw), min(y + h, fh)
+        if x1 >= x2 or y1 >= y2:
+            return frame
+        
+        roi = frame[y1:y2, x1:x2]
+        cv2.copyTo(tile[y1 - y:y2 - y, x1 - x:x2 - x], mask[y1 - y:y2 - y, x1 - x:x2 - x], roi)
+        
+        return frame
+    
+    def draw_cached_text(self, frame, text, org, font, scale, color, thickness):
+        """Same as cv2.putText, but blits glyphs rendered on first use"""
+        tile, mask, (origin_x, origin_y) = self.get_text_sprite(text, font, scale, color, thickness)
+        return self.blit_sprite(frame, tile, mask, (org[0] - origin_x, org[1] - origin_y))
+    
+    def get_ring_sprite(self, radius, color, thickness):
+        """Render a circle outline once into a (color tile, mask, center offset) sprite"""
+        key = (radius, color, thickness)
+        sprite = self.ring_sprites.get(key)
+        if sprite is not None:
+            return sprite
+        
+        c = radius + thickness
+        mask = np.zeros((2 * c + 1, 2 * c + 1), dtype=np.uint8)
+        cv2.circle(mask, (c, c), radius, 255, thickness)
+        
+        tile = np.empty(mask.shape + (3,), dtype=np.uint8)
+        tile[:] = color
+        
+        sprite = (tile, mask, (c, c))
+        self.ring_sprites[key] = sprite
+        return sprite
+    
+    def draw_cached_ring(self, frame, center, radius, color, thickness):
+        """Same as cv2.circle with an outline thickness, but blits a cached ring"""
+        tile, mask, (cx, cy) = self.get_ring_sprite(radius, color, thickness)
+        return self.blit_sprite(frame, tile, mask, (center[0] - cx, center[1] - cy))
+    
+    def blend_lut(self, color, alpha):
+        """(1, 256, 3) cv2.LUT table for x * (1 - alpha) + color * alpha, rounded like addWeighted"""
+        levels = np.arange(256, dtype=np.float64)[:, None]
+        table = np.rint(levels * (1 - alpha) + np.array(color, dtype=np.float64) * alpha)
+        return np.clip(table, 0, 255).astype(np.uint8).reshape(1, 256, 3)
+    
+    def blend_rect(self, frame, pt1, pt2, color, alpha):
+        """Blend a filled rectangle (corners inclusive, like cv2.rectangle) into frame in place
+        
+        Same result as drawing it on a frame copy and calling
+        cv2.addWeighted(frame, 1 - alpha, overlay, alpha, 0), but only the
+        rectangle is touched
+        """
+        fh, fw = frame.shape[:2]
+        x1, y1 = max(pt1[0], 0), max(pt1[1], 0)
+        x2, y2 = min(pt2[0] + 1, fw), min(pt2[1] + 1, fh)
+        if x1 >= x2 or y1 >= y2:
+            return frame
+        
+        roi = frame[y1:y2, x1:x2]
+        key = (y2 - y1, x2 - x1, color)
+        solid = self.solid_tiles.get(key)
+        if solid is None:
+            solid = np.empty_like(roi)
+            solid[:] = color
+            self.solid_tiles[key] = solid
+        
+        cv2.addWeighted(roi, 1 - alpha, solid, alpha, 0, dst=roi)
+        return frame
+    
+    def render_sprite(self, shape, bbox, render):
+        """Capture what render(layer, origin) draws as a (tile, mask, top-left) sprite
+        
+        Only the bbox (x1, y1, x2, y2) of a frame of this shape is rendered:
+        layer is a canvas of that size and render must draw shifted by
+        -origin, the canvas top-left in frame coordinates. render may only
+        draw opaque shapes and text, so the pixels it touches come out the
+        same on an all-black and an all-white layer. Returns None if nothing
+        was drawn
+        """
+        fh, fw = shape[:2]
+        x1, y1 = max(bbox[0], 0), max(bbox[1], 0)
+        x2, y2 = min(bbox[2], fw), min(bbox[3], fh)
+        if x1 >= x2 or y1 >= y2:
+            return None
+        
+        canvas_shape = (y2 - y1, x2 - x1) + tuple(shape[2:])
+        black = render(np.zeros(canvas_shape, dtype=np.uint8), (x1, y1))
+        white = render(np.full(canvas_shape, 255, dtype=np.uint8), (x1, y1))
+        touched = np.all(black == white, axis=2)
+        if not touched.any():
+            return None
+        
+        ys, xs = np.flatnonzero(touched.any(axis=1)), np.flatnonzero(touched.any(axis=0))
+        ty1, ty2, tx1, tx2 = ys[0], ys[-1] + 1, xs[0], xs[-1] + 1
+        mask = touched[ty1:ty2, tx1:tx2].astype(np.uint8) * 255
+        return black[ty1:ty2, tx1:tx2].copy(), mask, (int(x1 + tx1), int(y1 + ty1))
+    
+    def merge_sprites(self, sprites):
+        """Merge (tile, mask, top-left) sprites, later ones on top, into one sprite (None if empty)"""
+        if not sprites:
+            return None
+        
+        x1 = min(x for _, _, (x, _) in sprites)
+        y1 = min(y for _, _, (_, y) in sprites)
+        x2 = max(x + mask.shape[1] for _, mask, (x, _) in sprites)
+        y2 = max(y + mask.shape[0] for _, mask, (_, y) in sprites)
+        
+        tile = np.zeros((y2 - y1, x2 - x1, 3), dtype=np.uint8)
+        mask = np.zeros((y2 - y1, x2 - x1), dtype=np.uint8)
+        for sprite_tile, sprite_mask, (x, y) in sprites:
+            h, w = sprite_mask.shape
+            rows, cols = slice(y - y1, y - y1 + h), slice(x - x1, x - x1 + w)
+            cv2.copyTo(sprite_tile, sprite_mask, tile[rows, cols])
+            np.maximum(mask[rows, cols], sprite_mask, out=mask[rows, cols])
+        
+        return tile, mask, (x1, y1)
+    
+    def draw_sprite(self, frame, sprite):
+        """Blit a sprite from render_sprite (None draws nothing)"""
+        if sprite is None:
+            return frame
+        tile, mask, top_left = sprite
+        return self.blit_sprite(frame, tile, mask, top_left)